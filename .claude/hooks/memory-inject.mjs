@@ -0,0 +1,613 @@
+#!/usr/bin/env node
+// MyCC 记忆注入 Hook
+//
+// 替代 "每轮 cat 整个 status.md" 的做法：
+// - 维护记忆文件的 mtime/size/hash 清单，只在文件变化时重新读取和哈希
+// - 每个会话记录已注入过的版本，后续轮次只注入变化的部分；已完整注入过的文件只注入行级差异
+// - 短/中/长期三层各有 token 预算，超出时退回到预先生成的摘要
+// - 每轮记录各层耗时，`--report` 查看
+//
+// 用法（.claude/settings.local.json）：
+//   SessionStart      -> node .claude/hooks/memory-inject.mjs
+//   UserPromptSubmit  -> node .claude/hooks/memory-inject.mjs
+//
+// SessionStart 的 source 为 startup/clear/compact 时上下文是空的，会重新全量注入；
+// resume（含 `claude -p --resume`）沿用会话已注入的版本，只补变化。
+//
+// 其他命令：
+//   node .claude/hooks/memory-inject.mjs --report [N]   最近 N 轮的各层耗时
+//   node .claude/hooks/memory-inject.mjs --summarize    预先生成所有文件的摘要
+//   node .claude/hooks/memory-inject.mjs --reset        忽略已注入记录，强制全量注入
+
+import { createHash } from 'node:crypto';
+import fs from 'node:fs';
+import path from 'node:path';
+import { fileURLToPath } from 'node:url';
+
+const PROJECT_DIR = path.resolve(path.dirname(fileURLToPath(import.meta.url)), '..', '..');
+const CACHE_DIR = path.join(PROJECT_DIR, '.claude', 'cache', 'memory');
+const MANIFEST_FILE = path.join(CACHE_DIR, 'manifest.json');
+const SUMMARY_DIR = path.join(CACHE_DIR, 'summaries');
+const SNAPSHOT_DIR = path.join(CACHE_DIR, 'snapshots');
+const TIMINGS_FILE = path.join(CACHE_DIR, 'timings.jsonl');
+
+const MANIFEST_VERSION = 2;
+const SESSION_TTL_MS = 7 * 24 * 60 * 60 * 1000;
+const TIMINGS_MAX_BYTES = 1024 * 1024;
+const RESET_SOURCES = new Set(['startup', 'clear', 'compact']);
+const MIN_SUMMARY_TOKENS = 50;
+const DIFF_CONTEXT = 2;
+const MAX_DIFF_CELLS = 4_000_000;
+
+// 三层记忆，预算单位为估算 token，可用环境变量覆盖
+const LAYERS = [
+  {
+    name: 'short',
+    label: '短期记忆',
+    budget: envInt('MYCC_MEMORY_BUDGET_SHORT', 1500),
+    files: () => ['0-System/status.md'],
+  },
+  {
+    name: 'mid',
+    label: '中期记忆',
+    budget: envInt('MYCC_MEMORY_BUDGET_MID', 2000),
+    files: () => ['0-System/context.md'],
+    // 每天在末尾追加，截断时保留标题和末尾最新的内容
+    appendOnly: true,
+  },
+  {
+    name: 'long',
+    label: '长期记忆',
+    budget: envInt('MYCC_MEMORY_BUDGET_LONG', 3000),
+    files: () => [
+      ...listMarkdown('0-System/about-me'),
+      '0-System/goals.md',
+      '0-System/habits.md',
+    ],
+  },
+];
+
+function envInt(name, fallback) {
+  const value = Number.parseInt(process.env[name] ?? '', 10);
+  return Number.isFinite(value) && value > 0 ? value : fallback;
+}
+
+function listMarkdown(relDir) {
+  const result = [];
+  const walk = (rel) => {
+    let entries;
+    try {
+      entries = fs.readdirSync(path.join(PROJECT_DIR, rel), { withFileTypes: true });
+    } catch {
+      return;
+    }
+    for (const entry of entries) {
+      const child = `${rel}/${entry.name}`;
+      if (entry.isDirectory()) {
+        walk(child);
+      } else if (entry.name.endsWith('.md') && entry.name !== 'README.md' && !isSummaryFile(entry.name)) {
+        result.push(child);
+      }
+    }
+  };
+  walk(relDir);
+  return result.sort();
+}
+
+function isSummaryFile(name) {
+  return name.endsWith('.summary.md');
+}
+
+// 粗略估算：CJK 字符约 1 token，其余约 4 字符 1 token
+function estimateTokens(text) {
+  let cjk = 0;
+  for (const ch of text) {
+    const code = ch.codePointAt(0);
+    if ((code >= 0x3000 && code <= 0x9fff) || (code >= 0xf900 && code <= 0xfaff) || (code >= 0xff00 && code <= 0xffef)) {
+      cjk++;
+    }
+  }
+  return cjk + Math.ceil((text.length - cjk) / 4);
+}
+
+function sha1(text) {
+  return createHash('sha1').update(text).digest('hex');
+}
+
+function readJson(file, fallback) {
+  try {
+    return JSON.parse(fs.readFileSync(file, 'utf8'));
+  } catch {
+    return fallback;
+  }
+}
+
+// 删除不再需要的按 hash 缓存的文件（context.md 每天追加，否则会无限增长）
+function pruneCache(dir, live) {
+  let names;
+  try {
+    names = fs.readdirSync(dir);
+  } catch {
+    return;
+  }
+  for (const name of names) {
+    // .tmp 是其他进程正在写入的文件
+    if (name.endsWith('.tmp')) continue;
+    if (!live.has(path.basename(name, '.md'))) fs.rmSync(path.join(dir, name), { force: true });
+  }
+}
+
+// 摘要只保留文件当前版本的；快照保留仍有会话以它为基准做差异的版本
+function saveManifest(manifest) {
+  writeJsonAtomic(MANIFEST_FILE, manifest);
+  pruneCache(SUMMARY_DIR, new Set(Object.values(manifest.files).map((file) => file.hash)));
+  const baselines = new Set();
+  for (const session of Object.values(manifest.sessions)) {
+    for (const seen of Object.values(session.seen)) {
+      for (const version of Object.values(seen)) {
+        if (version.full) baselines.add(version.hash);
+      }
+    }
+  }
+  pruneCache(SNAPSHOT_DIR, baselines);
+}
+
+function writeFileAtomic(file, text) {
+  fs.mkdirSync(path.dirname(file), { recursive: true });
+  const tmp = `${file}.${process.pid}.tmp`;
+  fs.writeFileSync(tmp, text);
+  fs.renameSync(tmp, file);
+}
+
+function writeJsonAtomic(file, data) {
+  writeFileAtomic(file, JSON.stringify(data));
+}
+
+function loadManifest() {
+  const manifest = readJson(MANIFEST_FILE, null);
+  if (!manifest || manifest.version !== MANIFEST_VERSION) {
+    return { version: MANIFEST_VERSION, files: {}, sessions: {} };
+  }
+  return manifest;
+}
+
+function pruneSessions(manifest, now) {
+  for (const [id, session] of Object.entries(manifest.sessions)) {
+    if (now - (session.updatedAt ?? 0) > SESSION_TTL_MS) {
+      delete manifest.sessions[id];
+    }
+  }
+}
+
+// 读取文件当前状态；mtime/size 未变时复用清单里的 hash，不读内容
+function probe(manifest, rel) {
+  const abs = path.join(PROJECT_DIR, rel);
+  let stat;
+  try {
+    stat = fs.statSync(abs);
+  } catch {
+    delete manifest.files[rel];
+    return null;
+  }
+  const cached = manifest.files[rel];
+  if (cached && cached.mtimeMs === stat.mtimeMs && cached.size === stat.size) {
+    return { rel, hash: cached.hash, content: null, read: false };
+  }
+  const content = fs.readFileSync(abs, 'utf8');
+  const hash = sha1(content);
+  manifest.files[rel] = { mtimeMs: stat.mtimeMs, size: stat.size, hash };
+  return { rel, hash, content, read: true };
+}
+
+function loadContent(entry) {
+  if (entry.content === null) {
+    entry.content = fs.readFileSync(path.join(PROJECT_DIR, entry.rel), 'utf8');
+  }
+  return entry.content;
+}
+
+function isHeading(line) {
+  return /^#{1,6}\s/.test(line.trim());
+}
+
+// 抽取式摘要：保留全部标题，每节保留前几行，最后按预算截断
+function summarize(text) {
+  const lines = text.split('\n');
+  const kept = [];
+  let sectionLines = 0;
+  for (const line of lines) {
+    const trimmed = line.trim();
+    if (trimmed === '' || trimmed === '---' || trimmed.startsWith('<!--')) continue;
+    if (isHeading(trimmed)) {
+      kept.push(line);
+      sectionLines = 0;
+      continue;
+    }
+    if (sectionLines < 4) {
+      kept.push(line);
+      sectionLines++;
+    }
+  }
+  return kept.join('\n');
+}
+
+const TRUNCATED_MARK = '…（已截断）';
+
+// 默认保留开头；fromEnd 时保留全部标题，剩余预算从末尾往前填，截掉的是较早的内容
+function truncateToBudget(text, budget, { fromEnd = false } = {}) {
+  if (estimateTokens(text) <= budget) return text;
+  const lines = text.split('\n');
+  const cost = (line) => estimateTokens(line) + 1;
+  // 截断标记本身也占预算
+  let used = cost(TRUNCATED_MARK);
+  if (!fromEnd) {
+    const out = [];
+    for (const line of lines) {
+      if (used + cost(line) > budget) break;
+      out.push(line);
+      used += cost(line);
+    }
+    out.push(TRUNCATED_MARK);
+    return out.join('\n');
+  }
+  // 标题本身就放不下时退化为只保留末尾
+  const headingCost = lines.filter(isHeading).reduce((sum, line) => sum + cost(line), 0);
+  const keepHeadings = used + headingCost <= budget;
+  if (keepHeadings) used += headingCost;
+  let cut = lines.length;
+  while (cut > 0) {
+    const line = lines[cut - 1];
+    if (!(keepHeadings && isHeading(line))) {
+      if (used + cost(line) > budget) break;
+      used += cost(line);
+    }
+    cut--;
+  }
+  const head = keepHeadings ? lines.slice(0, cut).filter(isHeading) : [];
+  return [...head, TRUNCATED_MARK, ...lines.slice(cut)].join('\n');
+}
+
+// 完整注入过的版本按 hash 存一份快照，文件再变化时据此生成差异
+function readSnapshot(hash) {
+  try {
+    return fs.readFileSync(path.join(SNAPSHOT_DIR, `${hash}.md`), 'utf8');
+  } catch {
+    return null;
+  }
+}
+
+function writeSnapshot(entry) {
+  const file = path.join(SNAPSHOT_DIR, `${entry.hash}.md`);
+  if (!fs.existsSync(file)) writeFileAtomic(file, loadContent(entry));
+}
+
+// 行级差异：先去掉相同的首尾行，中间部分用 LCS 对齐；中间部分过大时整体视为替换
+function diffLines(a, b) {
+  let start = 0;
+  while (start < a.length && start < b.length && a[start] === b[start]) start++;
+  let endA = a.length;
+  let endB = b.length;
+  while (endA > start && endB > start && a[endA - 1] === b[endB - 1]) {
+    endA--;
+    endB--;
+  }
+  const ops = a.slice(0, start).map((line) => [' ', line]);
+  const n = endA - start;
+  const m = endB - start;
+  if (n * m <= MAX_DIFF_CELLS) {
+    // lcs[i * (m + 1) + j]：a[start+i..endA) 与 b[start+j..endB) 的最长公共子序列长度
+    const lcs = new Uint32Array((n + 1) * (m + 1));
+    for (let i = n - 1; i >= 0; i--) {
+      for (let j = m - 1; j >= 0; j--) {
+        lcs[i * (m + 1) + j] = a[start + i] === b[start + j]
+          ? lcs[(i + 1) * (m + 1) + j + 1] + 1
+          : Math.max(lcs[(i + 1) * (m + 1) + j], lcs[i * (m + 1) + j + 1]);
+      }
+    }
+    let i = 0;
+    let j = 0;
+    while (i < n || j < m) {
+      if (i < n && j < m && a[start + i] === b[start + j]) {
+        ops.push([' ', a[start + i]]);
+        i++;
+        j++;
+      } else if (j >= m || (i < n && lcs[(i + 1) * (m + 1) + j] >= lcs[i * (m + 1) + j + 1])) {
+        ops.push(['-', a[start + i++]]);
+      } else {
+        ops.push(['+', b[start + j++]]);
+      }
+    }
+  } else {
+    for (const line of a.slice(start, endA)) ops.push(['-', line]);
+    for (const line of b.slice(start, endB)) ops.push(['+', line]);
+  }
+  for (const line of a.slice(endA)) ops.push([' ', line]);
+  return ops;
+}
+
+// unified diff 格式，每处改动前后保留 DIFF_CONTEXT 行上下文
+function unifiedDiff(before, after) {
+  const ops = diffLines(before.split('\n'), after.split('\n'));
+  const positions = [];
+  let lineA = 1;
+  let lineB = 1;
+  for (const [type] of ops) {
+    positions.push([lineA, lineB]);
+    if (type !== '+') lineA++;
+    if (type !== '-') lineB++;
+  }
+  const hunks = [];
+  ops.forEach(([type], i) => {
+    if (type === ' ') return;
+    const last = hunks.at(-1);
+    if (last && i - last.end <= 2 * DIFF_CONTEXT) last.end = i;
+    else hunks.push({ start: i, end: i });
+  });
+  const out = [];
+  for (const hunk of hunks) {
+    const from = Math.max(0, hunk.start - DIFF_CONTEXT);
+    const to = Math.min(ops.length - 1, hunk.end + DIFF_CONTEXT);
+    const slice = ops.slice(from, to + 1);
+    const [startA, startB] = positions[from];
+    const lengthA = slice.filter(([type]) => type !== '+').length;
+    const lengthB = slice.filter(([type]) => type !== '-').length;
+    out.push(`@@ -${startA},${lengthA} +${startB},${lengthB} @@`);
+    for (const [type, line] of slice) out.push(`${type}${line}`);
+  }
+  return out.join('\n');
+}
+
+// 已完整注入过的文件，差异比原文短时只注入差异
+function changeBlock(layer, entry, previous) {
+  const block = formatBlock(layer, entry.rel, 'full', loadContent(entry).trim());
+  const baseline = previous?.full ? readSnapshot(previous.hash) : null;
+  if (baseline === null) return { entry, block, diff: false };
+  const diffBlock = formatBlock(layer, entry.rel, 'diff', `\`\`\`diff\n${unifiedDiff(baseline, loadContent(entry))}\n\`\`\``);
+  return estimateTokens(diffBlock) < estimateTokens(block) ? { entry, block: diffBlock, diff: true } : { entry, block, diff: false };
+}
+
+// 摘要优先级：手写的 xxx.summary.md > 按 hash 缓存的抽取式摘要
+function getSummary(layer, entry, budget) {
+  const truncate = (text) => truncateToBudget(text, budget, { fromEnd: layer.appendOnly });
+  const handWritten = path.join(PROJECT_DIR, entry.rel.replace(/\.md$/, '.summary.md'));
+  if (fs.existsSync(handWritten)) {
+    return { text: truncate(fs.readFileSync(handWritten, 'utf8').trim()), cached: true };
+  }
+  // 缓存不截断的摘要，同一版本在不同预算下都能复用
+  const cacheFile = path.join(SUMMARY_DIR, `${entry.hash}.md`);
+  if (fs.existsSync(cacheFile)) {
+    return { text: truncate(fs.readFileSync(cacheFile, 'utf8')), cached: true };
+  }
+  const text = summarize(loadContent(entry));
+  fs.mkdirSync(SUMMARY_DIR, { recursive: true });
+  fs.writeFileSync(cacheFile, text);
+  return { text: truncate(text), cached: false };
+}
+
+function processLayer(layer, manifest, seen) {
+  const started = process.hrtime.bigint();
+  const stats = { layer: layer.name, files: 0, read: 0, changed: 0, removed: 0, tokens: 0, mode: 'unchanged' };
+  const present = new Set();
+  const changed = [];
+
+  for (const rel of layer.files()) {
+    const entry = probe(manifest, rel);
+    if (!entry) continue;
+    stats.files++;
+    if (entry.read) stats.read++;
+    present.add(rel);
+    if (seen[rel]?.hash !== entry.hash) changed.push(entry);
+  }
+
+  const removed = [];
+  for (const rel of Object.keys(seen)) {
+    if (!present.has(rel)) removed.push(rel);
+  }
+  stats.changed = changed.length;
+  stats.removed = removed.length;
+
+  const blocks = [];
+  if (changed.length > 0) {
+    const full = changed.map((entry) => changeBlock(layer, entry, seen[entry.rel]));
+    // 原文或差异完整注入了的文件，之后的变化才能以它为基准做差异
+    const complete = new Set();
+    const fullTokens = full.reduce((sum, item) => sum + estimateTokens(item.block), 0);
+    if (fullTokens <= layer.budget) {
+      stats.mode = 'full';
+      for (const item of full) {
+        blocks.push(item.block);
+        complete.add(item);
+      }
+    } else {
+      // 超预算：剩余预算在剩下的文件间平分，放不下原文就用摘要，
+      // 连摘要都放不下的只列路径。路径清单的开销预先留出，保证总量不超预算
+      stats.mode = 'summary';
+      const skippedHeader = `[${layer.label}] 以下文件有更新，超出预算未注入，需要时直接读取：`;
+      const pathCost = (rel) => estimateTokens(`- ${rel}`) + 1;
+      let used = 0;
+      let reserved = estimateTokens(skippedHeader) + 2 + full.reduce((sum, item) => sum + pathCost(item.entry.rel), 0);
+      const skipped = [];
+      full.forEach((item, i) => {
+        reserved -= pathCost(item.entry.rel);
+        const share = Math.floor((layer.budget - used - reserved) / (full.length - i));
+        let block = item.block;
+        const fits = estimateTokens(block) <= share;
+        if (!fits) {
+          const header = estimateTokens(formatBlock(layer, item.entry.rel, 'summary', '')) + 1;
+          block = share - header >= MIN_SUMMARY_TOKENS
+            ? formatBlock(layer, item.entry.rel, 'summary', getSummary(layer, item.entry, share - header).text)
+            : null;
+        }
+        const cost = block ? estimateTokens(block) : 0;
+        if (!block || used + cost + reserved > layer.budget) {
+          skipped.push(item.entry.rel);
+          reserved += pathCost(item.entry.rel);
+          return;
+        }
+        blocks.push(block);
+        used += cost;
+        if (fits) complete.add(item);
+      });
+      if (skipped.length > 0) {
+        blocks.push(`${skippedHeader}\n${skipped.map((rel) => `- ${rel}`).join('\n')}`);
+      }
+      stats.skipped = skipped.length;
+    }
+    stats.diffs = [...complete].filter((item) => item.diff).length;
+    for (const item of full) {
+      seen[item.entry.rel] = { hash: item.entry.hash, full: complete.has(item) };
+      if (complete.has(item)) writeSnapshot(item.entry);
+    }
+  }
+  for (const rel of removed) {
+    blocks.push(`[${layer.label}] ${rel} 已删除`);
+    delete seen[rel];
+  }
+
+  const output = blocks.join('\n\n');
+  stats.tokens = output ? estimateTokens(output) : 0;
+  stats.ms = Number(process.hrtime.bigint() - started) / 1e6;
+  return { output, stats };
+}
+
+function formatBlock(layer, rel, mode, text) {
+  const tags = { summary: `摘要，完整内容见 ${rel}`, diff: `${rel} 自上次注入后的变更` };
+  const tag = tags[mode] ?? rel;
+  return `## [${layer.label}] ${tag}\n\n${text}`;
+}
+
+function readHookInput() {
+  if (process.stdin.isTTY) return {};
+  try {
+    const raw = fs.readFileSync(0, 'utf8');
+    return raw.trim() ? JSON.parse(raw) : {};
+  } catch {
+    return {};
+  }
+}
+
+function appendTimings(record) {
+  fs.mkdirSync(CACHE_DIR, { recursive: true });
+  try {
+    if (fs.statSync(TIMINGS_FILE).size > TIMINGS_MAX_BYTES) {
+      // 只保留后一半，避免日志无限增长
+      const lines = fs.readFileSync(TIMINGS_FILE, 'utf8').trim().split('\n');
+      fs.writeFileSync(TIMINGS_FILE, lines.slice(Math.floor(lines.length / 2)).join('\n') + '\n');
+    }
+  } catch {
+    // 文件不存在
+  }
+  fs.appendFileSync(TIMINGS_FILE, JSON.stringify(record) + '\n');
+}
+
+function formatTime(date) {
+  const pad = (n) => String(n).padStart(2, '0');
+  return `${date.getFullYear()}-${pad(date.getMonth() + 1)}-${pad(date.getDate())} ${pad(date.getHours())}:${pad(date.getMinutes())}`;
+}
+
+function inject({ reset }) {
+  const started = process.hrtime.bigint();
+  const input = readHookInput();
+  const sessionId = input.session_id || 'default';
+  const now = Date.now();
+
+  const manifest = loadManifest();
+  pruneSessions(manifest, now);
+  // 新会话、/clear、压缩后上下文里已经没有记忆，需要重新全量注入
+  const contextLost = input.hook_event_name === 'SessionStart' && RESET_SOURCES.has(input.source);
+  if (reset || contextLost || !manifest.sessions[sessionId]) {
+    manifest.sessions[sessionId] = { seen: {}, updatedAt: now };
+  }
+  const session = manifest.sessions[sessionId];
+
+  const outputs = [];
+  const layers = [];
+  for (const layer of LAYERS) {
+    session.seen[layer.name] ??= {};
+    const { output, stats } = processLayer(layer, manifest, session.seen[layer.name]);
+    if (output) outputs.push(output);
+    layers.push(stats);
+  }
+  session.updatedAt = now;
+  saveManifest(manifest);
+
+  const lines = [`当前时间：${formatTime(new Date(now))}`];
+  if (outputs.length > 0) {
+    lines.push('', ...outputs);
+  }
+  process.stdout.write(lines.join('\n') + '\n');
+
+  appendTimings({
+    ts: new Date(now).toISOString(),
+    session: sessionId,
+    reset: Boolean(reset || contextLost),
+    totalMs: Number(process.hrtime.bigint() - started) / 1e6,
+    layers,
+  });
+}
+
+function percentile(sorted, p) {
+  if (sorted.length === 0) return 0;
+  return sorted[Math.min(sorted.length - 1, Math.floor((p / 100) * sorted.length))];
+}
+
+function report(limit) {
+  let records = [];
+  try {
+    records = fs.readFileSync(TIMINGS_FILE, 'utf8').trim().split('\n').filter(Boolean).map((line) => JSON.parse(line));
+  } catch {
+    console.log('还没有耗时记录');
+    return;
+  }
+  records = records.slice(-limit);
+
+  console.log(`最近 ${records.length} 轮记忆注入耗时\n`);
+  console.log('层级    平均ms   p95ms   平均tokens   最大tokens   变化轮数   摘要轮数');
+  for (const layer of LAYERS) {
+    const rows = records.map((r) => r.layers.find((l) => l.layer === layer.name)).filter(Boolean);
+    if (rows.length === 0) continue;
+    const ms = rows.map((r) => r.ms).sort((a, b) => a - b);
+    const tokens = rows.map((r) => r.tokens);
+    const avg = (list) => list.reduce((a, b) => a + b, 0) / list.length;
+    console.log(
+      [
+        layer.name.padEnd(6),
+        avg(ms).toFixed(2).padStart(7),
+        percentile(ms, 95).toFixed(2).padStart(7),
+        avg(tokens).toFixed(0).padStart(12),
+        String(Math.max(...tokens)).padStart(12),
+        String(rows.filter((r) => r.mode !== 'unchanged').length).padStart(10),
+        String(rows.filter((r) => r.mode === 'summary').length).padStart(10),
+      ].join(' '),
+    );
+  }
+  const total = records.map((r) => r.totalMs).sort((a, b) => a - b);
+  console.log(`\n总计: 平均 ${(total.reduce((a, b) => a + b, 0) / total.length).toFixed(2)} ms, p95 ${percentile(total, 95).toFixed(2)} ms`);
+  console.log(`预算: short=${LAYERS[0].budget} mid=${LAYERS[1].budget} long=${LAYERS[2].budget} tokens`);
+}
+
+function precomputeSummaries() {
+  const manifest = loadManifest();
+  let count = 0;
+  for (const layer of LAYERS) {
+    for (const rel of layer.files()) {
+      const entry = probe(manifest, rel);
+      if (!entry) continue;
+      if (estimateTokens(loadContent(entry)) <= layer.budget) continue;
+      const { cached } = getSummary(layer, entry, layer.budget);
+      if (!cached) count++;
+      console.log(`${cached ? '已有' : '生成'}  ${rel}`);
+    }
+  }
+  saveManifest(manifest);
+  console.log(`\n新生成 ${count} 份摘要 -> ${path.relative(PROJECT_DIR, SUMMARY_DIR)}`);
+}
+
+const args = process.argv.slice(2);
+if (args[0] === '--report') {
+  report(Number.parseInt(args[1] ?? '', 10) || 100);
+} else if (args[0] === '--summarize') {
+  precomputeSummaries();
+} else {
+  inject({ reset: args.includes('--reset') });
+}
@@ -0,0 +1,155 @@
+#!/usr/bin/env node
+// 检索基准：memory-search CLI 端到端 vs grep 全文扫描
+//
+// 两边都按 CC 实际调用的方式计时：每次查询起一个新进程，包含 node 启动、
+// 加载索引、增量检查和查询，而不是只测内存里的 index.search()。
+//
+// 用法：
+//   node bench.mjs                      # 在当前 mycc 仓库上跑
+//   node bench.mjs --generate 20000     # 生成 2 万篇模拟笔记到临时目录再跑
+//   node bench.mjs --queries "复盘,cloudflared,周记 tunnel" --runs 10
+
+import { execFileSync, spawnSync } from 'node:child_process';
+import fs from 'node:fs';
+import os from 'node:os';
+import path from 'node:path';
+import { fileURLToPath } from 'node:url';
+import { PARA_DIRS } from './lib/search-index.mjs';
+
+const SCRIPT_DIR = path.dirname(fileURLToPath(import.meta.url));
+const DEFAULT_ROOT = path.resolve(SCRIPT_DIR, '..', '..', '..', '..');
+const CLI = path.join(SCRIPT_DIR, 'memory-search.mjs');
+const DEFAULT_QUERIES = ['复盘', '项目进展', 'cloudflared', 'prompt 模板', '周记 目标'];
+
+function parseArgs(argv) {
+  const opts = { root: DEFAULT_ROOT, generate: 0, runs: 5, queries: DEFAULT_QUERIES };
+  for (let i = 0; i < argv.length; i++) {
+    if (argv[i] === '--root') opts.root = path.resolve(argv[++i]);
+    else if (argv[i] === '--generate') opts.generate = Number.parseInt(argv[++i], 10);
+    else if (argv[i] === '--runs') opts.runs = Number.parseInt(argv[++i], 10);
+    else if (argv[i] === '--queries') opts.queries = argv[++i].split(',');
+  }
+  return opts;
+}
+
+const ZH_WORDS = ['复盘', '项目', '进展', '目标', '思考', '方法论', '周记', '习惯', '阅读', '写作', '产品', '用户', '增长', '模板', '会议', '灵感', '决策', '效率', '学习', '总结'];
+const EN_WORDS = ['claude', 'prompt', 'tunnel', 'cloudflared', 'backend', 'hook', 'skill', 'memory', 'deploy', 'review', 'typescript', 'agent'];
+
+function generateCorpus(count) {
+  const root = fs.mkdtempSync(path.join(os.tmpdir(), 'mycc-bench-'));
+  // mulberry32，固定种子保证每次生成的语料一致
+  let seed = 42;
+  const rand = (n) => {
+    seed = (seed + 0x6d2b79f5) | 0;
+    let t = Math.imul(seed ^ (seed >>> 15), 1 | seed);
+    t = (t + Math.imul(t ^ (t >>> 7), 61 | t)) ^ t;
+    return ((t ^ (t >>> 14)) >>> 0) % n;
+  };
+  // 每篇笔记只围绕少数几个词展开，接近真实笔记的稀疏分布
+  const sentence = (zh, en) => {
+    const parts = [];
+    for (let i = 0; i < 12; i++) parts.push(rand(4) === 0 ? en[rand(en.length)] : zh[rand(zh.length)]);
+    return parts.join(rand(3) === 0 ? ' ' : '');
+  };
+  for (let i = 0; i < count; i++) {
+    const zh = Array.from({ length: 4 }, () => ZH_WORDS[rand(ZH_WORDS.length)]);
+    const en = Array.from({ length: 2 }, () => EN_WORDS[rand(EN_WORDS.length)]);
+    const dir = path.join(root, PARA_DIRS[i % PARA_DIRS.length], `group-${Math.floor(i / 500)}`);
+    fs.mkdirSync(dir, { recursive: true });
+    const body = [`# 笔记 ${i}`, ''];
+    for (let j = 0; j < 20 + rand(40); j++) body.push(sentence(zh, en));
+    fs.writeFileSync(path.join(dir, `note-${i}.md`), body.join('\n'));
+  }
+  return root;
+}
+
+function time(fn) {
+  const start = process.hrtime.bigint();
+  const result = fn();
+  return { ms: Number(process.hrtime.bigint() - start) / 1e6, result };
+}
+
+function stats(samples) {
+  const sorted = [...samples].sort((a, b) => a - b);
+  const pick = (p) => sorted[Math.min(sorted.length - 1, Math.floor(p * sorted.length))];
+  return { p50: pick(0.5), p95: pick(0.95) };
+}
+
+// 与 CC 平时的做法一致：优先 ripgrep，没有则用 grep -r
+function grepCommand() {
+  if (spawnSync('rg', ['--version']).status === 0) return (q, dirs) => ['rg', ['-l', '-i', '-F', '--glob', '*.md', q, ...dirs]];
+  return (q, dirs) => ['grep', ['-r', '-l', '-i', '-F', '--include=*.md', q, ...dirs]];
+}
+
+function runGrep(build, root, query) {
+  const dirs = PARA_DIRS.filter((d) => fs.existsSync(path.join(root, d)));
+  const [cmd, args] = build(query, dirs);
+  try {
+    return execFileSync(cmd, args, { cwd: root, encoding: 'utf8', maxBuffer: 64 * 1024 * 1024 }).split('\n').filter(Boolean).length;
+  } catch (err) {
+    // grep/rg 无匹配时退出码为 1
+    if (err.status === 1) return 0;
+    throw err;
+  }
+}
+
+const fmt = (n) => n.toFixed(2).padStart(9);
+
+function runCli(root, ...args) {
+  const result = spawnSync(process.execPath, [CLI, ...args, '--root', root], { encoding: 'utf8', maxBuffer: 64 * 1024 * 1024 });
+  if (result.status !== 0) throw new Error(`memory-search 执行失败: ${result.stderr}`);
+  return result.stdout;
+}
+
+function search(root, query) {
+  return JSON.parse(runCli(root, 'search', ...query.split(' '), '-k', '10', '--json'));
+}
+
+function main() {
+  const opts = parseArgs(process.argv.slice(2));
+  const root = opts.generate > 0 ? generateCorpus(opts.generate) : opts.root;
+  console.log(`语料目录：${root}`);
+
+  const build = time(() => runCli(root, 'index', '--rebuild'));
+  console.log(build.result.trim());
+  console.log(`全量建索引（含进程启动）：${build.ms.toFixed(0)} ms`);
+
+  // 进程启动本身的开销，作为两边的共同下限
+  const node = stats(Array.from({ length: opts.runs }, () => time(() => spawnSync(process.execPath, ['-e', '0'])).ms));
+  console.log(`node 空进程启动：p50 ${node.p50.toFixed(0)} ms\n`);
+
+  const grep = grepCommand();
+  console.log('查询                 CLI p50   CLI p95    grep p50   grep p95   CLI 内部 load/update/query   命中(索引/grep)');
+  for (const query of opts.queries) {
+    const cliSamples = [];
+    const grepSamples = [];
+    const inner = { load: [], update: [], query: [] };
+    let hits = 0;
+    let grepHits = 0;
+    for (let i = 0; i < opts.runs; i++) {
+      const a = time(() => search(root, query));
+      cliSamples.push(a.ms);
+      for (const name of Object.keys(inner)) inner[name].push(a.result.timings[name]);
+      hits = a.result.results.length;
+      const b = time(() => runGrep(grep, root, query));
+      grepSamples.push(b.ms);
+      grepHits = b.result;
+    }
+    const s1 = stats(cliSamples);
+    const s2 = stats(grepSamples);
+    const breakdown = Object.values(inner).map((samples) => stats(samples).p50.toFixed(1)).join(' / ');
+    console.log(`${query.padEnd(16)} ${fmt(s1.p50)} ${fmt(s1.p95)}   ${fmt(s2.p50)} ${fmt(s2.p95)}   ${breakdown.padStart(26)}   ${hits}/${grepHits}`);
+  }
+
+  console.log('\n单位 ms，均为起新进程的端到端耗时；grep 命中数为全部匹配文件数，索引只取 top 10');
+  if (opts.generate === 0) return;
+
+  // 新增笔记会改变目录 mtime，下一次检索要做一次全量 stat 和增量索引（只在模拟语料上测，不动真实笔记）
+  fs.writeFileSync(path.join(root, PARA_DIRS[0], 'bench-probe.md'), '# bench probe\n\n新增笔记 cloudflared\n');
+  const changed = time(() => search(root, opts.queries[0]));
+  const { load, update, query } = changed.result.timings;
+  console.log(`新增 1 篇笔记后的首次检索：${changed.ms.toFixed(0)} ms（load ${load.toFixed(1)} / update ${update.toFixed(1)} / query ${query.toFixed(1)}）`);
+  fs.rmSync(root, { recursive: true, force: true });
+}
+
+main();
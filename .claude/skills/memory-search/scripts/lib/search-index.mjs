@@ -0,0 +1,682 @@
+// 记忆检索索引：BM25 倒排索引 + 可选的本地向量索引
+//
+// 索引存放在 <root>/.claude/cache/memory-search/，按文件 mtime/size 增量更新。
+// 中文按单字 + 相邻两字切分，英文/数字按单词切分，不依赖分词库。
+//
+// 磁盘格式：meta.json 存文档表（列式）和目录 mtime，倒排表按词哈希分成
+// SHARD_COUNT 个分片。一次查询只读 meta.json 和查询词所在的分片；
+// 目录 mtime 都没变时跳过逐文件 stat。
+
+import fs from 'node:fs';
+import path from 'node:path';
+
+export const PARA_DIRS = ['1-Inbox', '2-Projects', '3-Thinking', '4-Assets', '5-Archive'];
+
+const INDEX_VERSION = 2;
+const SHARD_COUNT = 64;
+// 原地修改文件不会改变目录 mtime：最近修改过的笔记每次都 stat，
+// 其余的超过这个间隔再查询时做一次全量 stat
+const FULL_SCAN_INTERVAL_MS = 5 * 60 * 1000;
+const RECENT_DOCS = 200;
+const DOC_FIELDS = ['path', 'mtimeMs', 'size', 'len', 'title'];
+const BM25_K1 = 1.2;
+const BM25_B = 0.75;
+const EMBED_CHARS = 2000;
+
+const HAN_RUN = /[㐀-䶿一-鿿豈-﫿]+/g;
+const WORD = /[a-z0-9][a-z0-9_]*/g;
+
+// 建索引时额外收录单字（unigrams），单字查询（如「书」）也能命中；
+// 查询时多字词只用 bigram，避免单字把常见字的文档全部拉进来
+export function tokenize(text, { unigrams = false } = {}) {
+  const tokens = [];
+  const lower = text.toLowerCase();
+  for (const match of lower.matchAll(WORD)) {
+    if (match[0].length > 1 || /\d/.test(match[0])) tokens.push(match[0]);
+  }
+  for (const match of lower.matchAll(HAN_RUN)) {
+    const run = Array.from(match[0]);
+    if (unigrams || run.length === 1) tokens.push(...run);
+    for (let i = 0; i < run.length - 1; i++) tokens.push(run[i] + run[i + 1]);
+  }
+  return tokens;
+}
+
+export function indexDir(root) {
+  return path.join(root, '.claude', 'cache', 'memory-search');
+}
+
+// 遍历 PARA 目录下的 Markdown；跳过各目录顶层的模板 README.md
+// onDir 在读取每个目录之前调用（PARA 目录不存在时也会调用）
+export function walkNotes(root, onFile, onDir) {
+  const walk = (rel) => {
+    onDir?.(rel);
+    let entries;
+    try {
+      entries = fs.readdirSync(path.join(root, rel), { withFileTypes: true });
+    } catch {
+      return;
+    }
+    for (const entry of entries) {
+      if (entry.name.startsWith('.')) continue;
+      const child = `${rel}/${entry.name}`;
+      if (entry.isDirectory()) {
+        walk(child);
+      } else if (entry.name.endsWith('.md') && !(entry.name === 'README.md' && !rel.includes('/'))) {
+        onFile(child);
+      }
+    }
+  };
+  for (const dir of PARA_DIRS) walk(dir);
+}
+
+function extractTitle(rel, text) {
+  const heading = text.match(/^#\s+(.+)$/m);
+  return heading ? heading[1].trim() : path.basename(rel, '.md');
+}
+
+// FNV-1a，决定词项落在哪个分片
+function shardOf(term) {
+  let hash = 0x811c9dc5;
+  for (let i = 0; i < term.length; i++) {
+    hash ^= term.charCodeAt(i);
+    hash = Math.imul(hash, 0x01000193);
+  }
+  return (hash >>> 0) % SHARD_COUNT;
+}
+
+function mtimeOf(file) {
+  try {
+    return fs.statSync(file).mtimeMs;
+  } catch {
+    return null;
+  }
+}
+
+function writeAtomic(file, data) {
+  const tmp = `${file}.${process.pid}.tmp`;
+  fs.writeFileSync(tmp, data);
+  fs.renameSync(tmp, file);
+}
+
+export class SearchIndex {
+  // docs[id] = { path, mtimeMs, size, len, title }，删除后为 null，id 复用
+  #docs = [];
+  #free = [];
+  #byPath = new Map();
+  // load() 读到的列式文档表；只查询时直接用它，需要增删文档时才展开成上面的对象表
+  #columns = null;
+
+  constructor(root) {
+    this.root = root;
+    this.dir = indexDir(root);
+    this.lockFile = path.join(this.dir, 'update.lock');
+    // 上次读到的 meta.json 的 mtime/size，用来判断其他进程是否保存过
+    this.metaStamp = null;
+    // 持有更新锁期间为 true
+    this.locked = false;
+    this.#reset();
+  }
+
+  #reset() {
+    this.#docs = [];
+    this.#free = [];
+    this.#byPath = new Map();
+    this.#columns = null;
+    // term -> [docId, tf, docId, tf, ...]，分片按需加载
+    this.postings = new Map();
+    this.loadedShards = new Set();
+    this.dirtyShards = new Set();
+    // 分片每次写成新文件，写完再更新 meta.json 指向它们，写到一半崩溃也不会读到不一致的索引
+    this.shardFiles = new Array(SHARD_COUNT).fill(null);
+    // 本进程读到、保存时被替换掉的分片文件，meta.json 落盘后删除
+    this.replacedShards = [];
+    // 目录相对路径 -> mtimeMs，用于判断能否跳过逐文件 stat
+    this.dirs = {};
+    // 最近修改的笔记 [[path, mtimeMs, size], ...]
+    this.recent = [];
+    this.scannedAt = 0;
+    this.totalLen = 0;
+    this.liveDocs = 0;
+    this.dirty = false;
+  }
+
+  static load(root) {
+    const index = new SearchIndex(root);
+    index.#reload();
+    return index;
+  }
+
+  // 按磁盘上的 meta.json 重置内存状态；meta.json 和上次读到的一样时什么都不做，返回 false
+  #reload() {
+    const file = path.join(this.dir, 'meta.json');
+    let stamp = null;
+    let meta = null;
+    try {
+      const stat = fs.statSync(file);
+      stamp = `${stat.mtimeMs}:${stat.size}`;
+      if (stamp === this.metaStamp) return false;
+      meta = JSON.parse(fs.readFileSync(file, 'utf8'));
+    } catch {
+      meta = null;
+    }
+    this.metaStamp = stamp;
+    this.#reset();
+    if (!meta || meta.version !== INDEX_VERSION) return true;
+    const { path: paths, len } = meta.docs;
+    for (let id = 0; id < paths.length; id++) {
+      if (paths[id] === null) continue;
+      this.totalLen += len[id];
+      this.liveDocs++;
+    }
+    this.#columns = meta.docs;
+    this.shardFiles = meta.shards;
+    this.dirs = meta.dirs;
+    this.recent = meta.recent;
+    this.scannedAt = meta.scannedAt;
+    return true;
+  }
+
+  // 索引文件已损坏：丢掉内存状态，下次保存时替换掉残留的分片
+  #discard() {
+    const names = this.shardFiles.filter(Boolean);
+    this.#reset();
+    this.replacedShards = names;
+  }
+
+  #expand() {
+    const columns = this.#columns;
+    if (!columns) return;
+    this.#columns = null;
+    for (let id = 0; id < columns.path.length; id++) {
+      if (columns.path[id] === null) {
+        this.#docs.push(null);
+        this.#free.push(id);
+        continue;
+      }
+      this.#docs.push(this.#columnDoc(columns, id));
+      this.#byPath.set(columns.path[id], id);
+    }
+  }
+
+  #columnDoc(columns, id) {
+    return {
+      path: columns.path[id],
+      mtimeMs: columns.mtimeMs[id],
+      size: columns.size[id],
+      len: columns.len[id],
+      title: columns.title[id],
+    };
+  }
+
+  get docs() {
+    this.#expand();
+    return this.#docs;
+  }
+
+  get byPath() {
+    this.#expand();
+    return this.#byPath;
+  }
+
+  get free() {
+    this.#expand();
+    return this.#free;
+  }
+
+  // 按 id 取单篇文档，不触发展开
+  doc(id) {
+    if (this.#columns) return this.#columns.path[id] === null ? null : this.#columnDoc(this.#columns, id);
+    return this.#docs[id];
+  }
+
+  // 读取分片。分片文件不存在说明读 meta.json 之后其他进程保存过：重读 meta.json；
+  // meta.json 没变却缺文件说明索引已损坏：清空后全量重建。
+  // 返回 false 表示内存状态已被替换，调用方要从头再来
+  #loadShards(shards) {
+    for (const shard of shards) {
+      if (this.loadedShards.has(shard)) continue;
+      const name = this.shardFiles[shard];
+      if (name) {
+        let data;
+        try {
+          data = JSON.parse(fs.readFileSync(path.join(this.dir, 'postings', name), 'utf8'));
+        } catch (err) {
+          if (err.code !== 'ENOENT') throw err;
+          if (!this.#reload()) {
+            this.#discard();
+            if (!this.locked) this.sync({ full: true });
+          }
+          return false;
+        }
+        for (const term in data) this.postings.set(term, data[term]);
+      }
+      this.loadedShards.add(shard);
+    }
+    return true;
+  }
+
+  #loadAllShards() {
+    return this.#loadShards(Array.from({ length: SHARD_COUNT }, (_, shard) => shard));
+  }
+
+  get termCount() {
+    for (let attempt = 0; attempt < 3 && !this.#loadAllShards(); attempt++);
+    return this.postings.size;
+  }
+
+  // 更新锁：同一时间只允许一个进程更新索引，拿不到返回 null，否则返回释放函数。
+  // 持锁进程已退出（崩溃）时视为失效
+  lock() {
+    fs.mkdirSync(this.dir, { recursive: true });
+    for (let attempt = 0; attempt < 2; attempt++) {
+      try {
+        fs.writeFileSync(this.lockFile, String(process.pid), { flag: 'wx' });
+        this.locked = true;
+        return () => {
+          this.locked = false;
+          fs.rmSync(this.lockFile, { force: true });
+        };
+      } catch (err) {
+        if (err.code !== 'EEXIST') throw err;
+      }
+      try {
+        const pid = Number.parseInt(fs.readFileSync(this.lockFile, 'utf8'), 10);
+        if (pid) {
+          process.kill(pid, 0);
+          return null;
+        }
+        // 刚创建还没写入 PID 的锁文件是空的；一直为空说明创建者已崩溃
+        if (Date.now() - fs.statSync(this.lockFile).mtimeMs < 10000) return null;
+        fs.rmSync(this.lockFile, { force: true });
+      } catch (err) {
+        if (err.code !== 'ESRCH') return null;
+        fs.rmSync(this.lockFile, { force: true });
+      }
+    }
+    return null;
+  }
+
+  // 加锁增量更新并保存，返回 update() 的统计；rebuild 为 true 时丢掉旧索引全量重建。
+  // 其他进程正在更新时返回 null，调用方直接查询现有索引即可
+  sync({ full = false, rebuild = false } = {}) {
+    if (!full && !rebuild && this.canSkipScan()) return { added: 0, updated: 0, removed: 0, scanned: false };
+    const release = this.lock();
+    if (!release) return null;
+    try {
+      // 等锁期间其他进程可能刚保存过，以磁盘上的最新版本为准
+      this.#reload();
+      if (rebuild) this.#discard();
+      const stats = this.update({ full: full || rebuild });
+      this.save();
+      return stats;
+    } finally {
+      release();
+    }
+  }
+
+  // 只在持有更新锁时调用（见 sync()）
+  save() {
+    if (!this.dirty) return;
+    const shardDir = path.join(this.dir, 'postings');
+    fs.mkdirSync(shardDir, { recursive: true });
+    if (this.dirtyShards.size > 0) {
+      const grouped = new Map([...this.dirtyShards].map((shard) => [shard, {}]));
+      for (const [term, list] of this.postings) {
+        const data = grouped.get(shardOf(term));
+        if (data) data[term] = list;
+      }
+      const suffix = `${Date.now().toString(36)}${process.pid.toString(36)}`;
+      for (const [shard, data] of grouped) {
+        const name = `${shard}.${suffix}.json`;
+        fs.writeFileSync(path.join(shardDir, name), JSON.stringify(data));
+        if (this.shardFiles[shard]) this.replacedShards.push(this.shardFiles[shard]);
+        this.shardFiles[shard] = name;
+      }
+    }
+
+    const columns = Object.fromEntries(DOC_FIELDS.map((field) => [field, this.docs.map((doc) => (doc ? doc[field] : null))]));
+    const metaFile = path.join(this.dir, 'meta.json');
+    writeAtomic(
+      metaFile,
+      JSON.stringify({
+        version: INDEX_VERSION,
+        scannedAt: this.scannedAt,
+        dirs: this.dirs,
+        recent: this.recent,
+        shards: this.shardFiles,
+        docs: columns,
+      }),
+    );
+    const stat = fs.statSync(metaFile);
+    this.metaStamp = `${stat.mtimeMs}:${stat.size}`;
+
+    // meta.json 落盘后，只删除本进程读到并替换掉的旧分片，以及 v1 的 index.json。
+    // 正在查询的其他进程如果恰好要读这些分片，会重读 meta.json
+    for (const name of this.replacedShards) fs.rmSync(path.join(shardDir, name), { force: true });
+    fs.rmSync(path.join(this.dir, 'index.json'), { force: true });
+    this.replacedShards = [];
+    this.dirtyShards.clear();
+    this.dirty = false;
+  }
+
+  // 上次全量扫描后目录结构没变（mtime 一致）、最近修改的笔记也没变，
+  // 且未超过复查间隔时，不必逐文件 stat
+  canSkipScan() {
+    const dirs = Object.keys(this.dirs);
+    if (dirs.length === 0 || Date.now() - this.scannedAt > FULL_SCAN_INTERVAL_MS) return false;
+    if (!dirs.every((rel) => mtimeOf(path.join(this.root, rel)) === this.dirs[rel])) return false;
+    return this.recent.every(([rel, mtimeMs, size]) => {
+      try {
+        const stat = fs.statSync(path.join(this.root, rel));
+        return stat.mtimeMs === mtimeMs && stat.size === size;
+      } catch {
+        return false;
+      }
+    });
+  }
+
+  // 按 mtime/size 增量同步，返回 { added, updated, removed, scanned }
+  // full 为 true 时忽略目录 mtime，总是逐文件检查。多进程下请用 sync()
+  update({ full = false } = {}) {
+    const stats = { added: 0, updated: 0, removed: 0, scanned: false };
+    if (!full && this.canSkipScan()) return stats;
+
+    stats.scanned = true;
+    const seen = new Set();
+    const stale = new Set();
+    const pending = [];
+    const dirs = {};
+    walkNotes(
+      this.root,
+      (rel) => {
+        seen.add(rel);
+        let stat;
+        try {
+          stat = fs.statSync(path.join(this.root, rel));
+        } catch {
+          return;
+        }
+        const id = this.byPath.get(rel);
+        const doc = id === undefined ? null : this.docs[id];
+        if (doc && doc.mtimeMs === stat.mtimeMs && doc.size === stat.size) return;
+        if (doc) {
+          stale.add(id);
+          stats.updated++;
+        } else {
+          stats.added++;
+        }
+        pending.push({ rel, stat });
+      },
+      (rel) => {
+        dirs[rel] = mtimeOf(path.join(this.root, rel));
+      },
+    );
+    for (const [rel, id] of this.byPath) {
+      if (!seen.has(rel)) {
+        stale.add(id);
+        stats.removed++;
+      }
+    }
+    // 分片缺失导致内存状态被替换时，按新状态重新比对
+    if ((stale.size > 0 || pending.length > 0) && !this.#loadAllShards()) return this.update({ full: true });
+    this.removeDocs(stale);
+    for (const { rel, stat } of pending) {
+      this.addDoc(rel, stat, fs.readFileSync(path.join(this.root, rel), 'utf8'));
+    }
+    this.dirs = dirs;
+    this.recent = this.docs
+      .filter(Boolean)
+      .sort((a, b) => b.mtimeMs - a.mtimeMs)
+      .slice(0, RECENT_DOCS)
+      .map((doc) => [doc.path, doc.mtimeMs, doc.size]);
+    this.scannedAt = Date.now();
+    this.dirty = true;
+    return stats;
+  }
+
+  addDoc(rel, stat, text) {
+    const tokens = tokenize(`${rel}\n${text}`, { unigrams: true });
+    const tf = new Map();
+    for (const token of tokens) tf.set(token, (tf.get(token) ?? 0) + 1);
+
+    const id = this.free.length > 0 ? this.free.pop() : this.docs.length;
+    this.docs[id] = {
+      path: rel,
+      mtimeMs: stat.mtimeMs,
+      size: stat.size,
+      len: tokens.length,
+      title: extractTitle(rel, text),
+    };
+    for (const [term, count] of tf) {
+      let list = this.postings.get(term);
+      if (!list) {
+        list = [];
+        this.postings.set(term, list);
+      }
+      list.push(id, count);
+      this.dirtyShards.add(shardOf(term));
+    }
+    this.byPath.set(rel, id);
+    this.totalLen += tokens.length;
+    this.liveDocs++;
+    this.dirty = true;
+  }
+
+  // 批量删除：一次遍历全部倒排表，不必为每篇文档保存正排词表
+  removeDocs(ids) {
+    if (ids.size === 0) return;
+    for (const [term, list] of this.postings) {
+      const next = [];
+      for (let i = 0; i < list.length; i += 2) {
+        if (!ids.has(list[i])) next.push(list[i], list[i + 1]);
+      }
+      if (next.length === list.length) continue;
+      if (next.length === 0) this.postings.delete(term);
+      else this.postings.set(term, next);
+      this.dirtyShards.add(shardOf(term));
+    }
+    for (const id of ids) {
+      const doc = this.docs[id];
+      this.byPath.delete(doc.path);
+      this.docs[id] = null;
+      this.free.push(id);
+      this.totalLen -= doc.len;
+      this.liveDocs--;
+    }
+    this.dirty = true;
+  }
+
+  // BM25 打分，返回 [{ id, score }]，按分数降序
+  search(query, k = 10) {
+    const terms = [...new Set(tokenize(query))];
+    const shards = [...new Set(terms.map(shardOf))];
+    for (let attempt = 0; attempt < 3 && !this.#loadShards(shards); attempt++);
+    if (terms.length === 0 || this.liveDocs === 0) return [];
+    const avgdl = this.totalLen / this.liveDocs;
+    const lens = this.#columns ? this.#columns.len : this.#docs.map((doc) => doc?.len ?? 0);
+    const scores = new Float64Array(lens.length);
+    const touched = [];
+    for (const term of terms) {
+      const list = this.postings.get(term);
+      if (!list) continue;
+      const df = list.length / 2;
+      const idf = Math.log(1 + (this.liveDocs - df + 0.5) / (df + 0.5));
+      for (let i = 0; i < list.length; i += 2) {
+        const id = list[i];
+        const tf = list[i + 1];
+        const norm = tf + BM25_K1 * (1 - BM25_B + (BM25_B * lens[id]) / avgdl);
+        if (scores[id] === 0) touched.push(id);
+        scores[id] += (idf * tf * (BM25_K1 + 1)) / norm;
+      }
+    }
+    // 只维护长度为 k 的有序数组，避免对全部命中排序
+    const top = [];
+    for (const id of touched) {
+      const score = scores[id];
+      if (top.length === k && score <= top[k - 1].score) continue;
+      let i = top.length < k ? top.length : k - 1;
+      while (i > 0 && top[i - 1].score < score) {
+        top[i] = top[i - 1];
+        i--;
+      }
+      top[i] = { id, score };
+    }
+    return top;
+  }
+
+  snippet(id, query) {
+    const doc = this.doc(id);
+    let text;
+    try {
+      text = fs.readFileSync(path.join(this.root, doc.path), 'utf8');
+    } catch {
+      return '';
+    }
+    const needles = [query.toLowerCase(), ...tokenize(query)];
+    for (const line of text.split('\n')) {
+      const lower = line.toLowerCase();
+      if (line.trim() && !line.startsWith('#') && needles.some((needle) => lower.includes(needle))) {
+        return line.trim().slice(0, 120);
+      }
+    }
+    return '';
+  }
+}
+
+function topK(items, k) {
+  return items.sort((a, b) => b.score - a.score).slice(0, k);
+}
+
+// ---------------------------------------------------------------------------
+// 向量索引（可选）
+//
+// 设置 MYCC_EMBED_URL 后启用，支持 Ollama（/api/embeddings）和
+// OpenAI 兼容接口（/v1/embeddings）。向量存成 Float32 二进制，暴力余弦检索。
+
+export function embeddingConfig() {
+  const url = process.env.MYCC_EMBED_URL;
+  if (!url) return null;
+  return { url, model: process.env.MYCC_EMBED_MODEL || 'nomic-embed-text' };
+}
+
+async function embed(config, text) {
+  const isOllama = config.url.includes('/api/embeddings');
+  let res;
+  try {
+    res = await fetch(config.url, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify(isOllama ? { model: config.model, prompt: text } : { model: config.model, input: text }),
+    });
+  } catch (err) {
+    throw new Error(`无法连接 embedding 服务 ${config.url}: ${err.message}`);
+  }
+  if (!res.ok) throw new Error(`embedding 请求失败: HTTP ${res.status}`);
+  const data = await res.json();
+  const vector = isOllama ? data.embedding : data.data?.[0]?.embedding;
+  if (!Array.isArray(vector)) throw new Error('embedding 返回格式无法识别');
+  return normalize(Float32Array.from(vector));
+}
+
+function normalize(vector) {
+  let sum = 0;
+  for (const v of vector) sum += v * v;
+  const norm = Math.sqrt(sum) || 1;
+  for (let i = 0; i < vector.length; i++) vector[i] /= norm;
+  return vector;
+}
+
+export class VectorIndex {
+  constructor(index, config) {
+    this.index = index;
+    this.config = config;
+    this.metaFile = path.join(index.dir, 'vectors.json');
+    this.dataFile = path.join(index.dir, 'vectors.bin');
+    // entries: path -> { mtimeMs, size, slot }
+    this.entries = new Map();
+    this.dim = 0;
+    this.data = new Float32Array(0);
+  }
+
+  static load(index, config) {
+    const vectors = new VectorIndex(index, config);
+    try {
+      const meta = JSON.parse(fs.readFileSync(vectors.metaFile, 'utf8'));
+      if (meta.model !== config.model) return vectors;
+      const buffer = fs.readFileSync(vectors.dataFile);
+      // 两个文件分别原子替换，长度对不上说明写到一半被打断，当作没有向量索引
+      if (buffer.byteLength !== Object.keys(meta.entries).length * meta.dim * 4) return vectors;
+      vectors.dim = meta.dim;
+      vectors.data = new Float32Array(buffer.buffer, buffer.byteOffset, buffer.byteLength / 4);
+      vectors.entries = new Map(Object.entries(meta.entries));
+    } catch {
+      // 还没有向量索引
+    }
+    return vectors;
+  }
+
+  // 只对新增/修改过的笔记重新计算 embedding；调用方需持有 index.lock()
+  async update() {
+    const pending = [];
+    for (const doc of this.index.docs) {
+      if (!doc) continue;
+      const entry = this.entries.get(doc.path);
+      if (!entry || entry.mtimeMs !== doc.mtimeMs || entry.size !== doc.size) pending.push(doc);
+    }
+    const live = new Set(this.index.byPath.keys());
+    const stale = [...this.entries.keys()].filter((rel) => !live.has(rel));
+    if (pending.length === 0 && stale.length === 0) return 0;
+
+    const vectors = new Map();
+    for (const [rel, entry] of this.entries) {
+      if (live.has(rel)) vectors.set(rel, { ...entry, vector: this.data.subarray(entry.slot * this.dim, (entry.slot + 1) * this.dim) });
+    }
+    for (const doc of pending) {
+      const text = fs.readFileSync(path.join(this.index.root, doc.path), 'utf8').slice(0, EMBED_CHARS);
+      const vector = await embed(this.config, `${doc.title}\n${text}`);
+      vectors.set(doc.path, { mtimeMs: doc.mtimeMs, size: doc.size, vector });
+    }
+
+    this.dim = vectors.size > 0 ? vectors.values().next().value.vector.length : 0;
+    this.data = new Float32Array(vectors.size * this.dim);
+    this.entries = new Map();
+    let slot = 0;
+    for (const [rel, { mtimeMs, size, vector }] of vectors) {
+      this.data.set(vector, slot * this.dim);
+      this.entries.set(rel, { mtimeMs, size, slot });
+      slot++;
+    }
+    fs.mkdirSync(this.index.dir, { recursive: true });
+    writeAtomic(this.dataFile, Buffer.from(this.data.buffer));
+    writeAtomic(
+      this.metaFile,
+      JSON.stringify({ model: this.config.model, dim: this.dim, entries: Object.fromEntries(this.entries) }),
+    );
+    return pending.length;
+  }
+
+  async search(query, k = 10) {
+    if (this.entries.size === 0) return [];
+    const q = await embed(this.config, query);
+    const results = [];
+    for (const [rel, { slot }] of this.entries) {
+      const id = this.index.byPath.get(rel);
+      if (id === undefined) continue;
+      let dot = 0;
+      const offset = slot * this.dim;
+      for (let i = 0; i < this.dim; i++) dot += q[i] * this.data[offset + i];
+      results.push({ id, score: dot });
+    }
+    return topK(results, k);
+  }
+}
+
+// Reciprocal Rank Fusion：合并 BM25 与向量两路结果
+export function fuse(lists, k) {
+  const scores = new Map();
+  for (const list of lists) {
+    list.forEach(({ id }, rank) => scores.set(id, (scores.get(id) ?? 0) + 1 / (60 + rank + 1)));
+  }
+  return topK([...scores].map(([id, score]) => ({ id, score })), k);
+}
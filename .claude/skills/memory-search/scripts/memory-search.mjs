@@ -0,0 +1,150 @@
+#!/usr/bin/env node
+// 记忆检索 CLI
+//
+// 用法：
+//   node memory-search.mjs search <关键词...> [-k 10] [--json] [--vector] [--no-update]
+//   node memory-search.mjs index [--rebuild]      # 总是逐文件检查，不依赖目录 mtime
+//   node memory-search.mjs stats
+//
+// 通用参数：--root <dir>  项目根目录（默认为本脚本所在的 mycc 仓库）
+
+import fs from 'node:fs';
+import path from 'node:path';
+import { fileURLToPath } from 'node:url';
+import { SearchIndex, VectorIndex, embeddingConfig, fuse, indexDir } from './lib/search-index.mjs';
+
+const DEFAULT_ROOT = path.resolve(path.dirname(fileURLToPath(import.meta.url)), '..', '..', '..', '..');
+
+function parseArgs(argv) {
+  const opts = { command: argv[0], terms: [], k: 10, json: false, vector: false, update: true, rebuild: false, root: DEFAULT_ROOT };
+  for (let i = 1; i < argv.length; i++) {
+    const arg = argv[i];
+    if (arg === '-k') opts.k = Number.parseInt(argv[++i], 10) || 10;
+    else if (arg === '--json') opts.json = true;
+    else if (arg === '--vector') opts.vector = true;
+    else if (arg === '--no-update') opts.update = false;
+    else if (arg === '--rebuild') opts.rebuild = true;
+    else if (arg === '--root') opts.root = path.resolve(argv[++i]);
+    else opts.terms.push(arg);
+  }
+  return opts;
+}
+
+function ms(start) {
+  return Number(process.hrtime.bigint() - start) / 1e6;
+}
+
+async function openIndex(opts) {
+  const timings = {};
+  let t = process.hrtime.bigint();
+  const index = SearchIndex.load(opts.root);
+  timings.load = ms(t);
+
+  let changes = { added: 0, updated: 0, removed: 0 };
+  if (opts.update) {
+    t = process.hrtime.bigint();
+    // 另一个进程正在更新时返回 null，直接查现有索引
+    changes = index.sync({ full: opts.full, rebuild: opts.rebuild });
+    timings.update = ms(t);
+  }
+
+  let vectors = null;
+  const config = embeddingConfig();
+  if (opts.vector) {
+    if (!config) throw new Error('向量检索需要设置 MYCC_EMBED_URL（如 http://localhost:11434/api/embeddings）');
+    vectors = VectorIndex.load(index, config);
+    const release = opts.update && changes ? index.lock() : null;
+    if (release) {
+      t = process.hrtime.bigint();
+      try {
+        changes.embedded = await vectors.update();
+      } finally {
+        release();
+      }
+      timings.embed = ms(t);
+    }
+  }
+  return { index, vectors, changes, timings };
+}
+
+async function search(opts) {
+  const query = opts.terms.join(' ').trim();
+  if (!query) throw new Error('请提供检索关键词');
+  const { index, vectors, timings } = await openIndex(opts);
+
+  const t = process.hrtime.bigint();
+  let hits = index.search(query, vectors ? opts.k * 3 : opts.k);
+  if (vectors) {
+    hits = fuse([hits, await vectors.search(query, opts.k * 3)], opts.k);
+  }
+  timings.query = ms(t);
+
+  const results = hits.map(({ id, score }) => {
+    const doc = index.doc(id);
+    return { path: doc.path, title: doc.title, score: Number(score.toFixed(4)), snippet: index.snippet(id, query) };
+  });
+
+  if (opts.json) {
+    console.log(JSON.stringify({ query, results, timings }, null, 2));
+    return;
+  }
+  if (results.length === 0) {
+    console.log(`没有找到与「${query}」相关的笔记`);
+  }
+  results.forEach((r, i) => {
+    console.log(`${i + 1}. ${r.path}  (${r.score})`);
+    if (r.title) console.log(`   ${r.title}`);
+    if (r.snippet) console.log(`   > ${r.snippet}`);
+  });
+  console.log(`\n${formatTimings(timings)}`);
+}
+
+function formatTimings(timings) {
+  return Object.entries(timings)
+    .map(([name, value]) => `${name} ${value.toFixed(1)}ms`)
+    .join(' | ');
+}
+
+async function index(opts) {
+  const { index, changes, timings } = await openIndex({ ...opts, update: true, full: true });
+  if (!changes) throw new Error('另一个进程正在更新索引，请稍后再试');
+  console.log(`索引已更新：新增 ${changes.added}，修改 ${changes.updated}，删除 ${changes.removed}` +
+    (changes.embedded !== undefined ? `，embedding ${changes.embedded}` : ''));
+  console.log(`共 ${index.liveDocs} 篇笔记，${index.termCount} 个词项`);
+  console.log(formatTimings(timings));
+}
+
+function stats(opts) {
+  const index = SearchIndex.load(opts.root);
+  const dir = indexDir(opts.root);
+  const size = (...names) => {
+    let bytes = 0;
+    for (const name of names) {
+      try {
+        bytes += fs.statSync(path.join(dir, name)).size;
+      } catch {
+        return '-';
+      }
+    }
+    return `${(bytes / 1024).toFixed(0)} KB`;
+  };
+  console.log(`索引目录：${path.relative(opts.root, dir)}`);
+  console.log(`笔记数：${index.liveDocs}`);
+  console.log(`词项数：${index.termCount}`);
+  console.log(`BM25 索引：${size('meta.json', ...index.shardFiles.filter(Boolean).map((name) => path.join('postings', name)))}`);
+  console.log(`向量索引：${size('vectors.bin')}${embeddingConfig() ? '' : '（未启用，设置 MYCC_EMBED_URL 开启）'}`);
+}
+
+const opts = parseArgs(process.argv.slice(2));
+const commands = { search, index, stats };
+const run = commands[opts.command];
+if (!run) {
+  console.log('用法: memory-search.mjs <search|index|stats> [参数]');
+  process.exit(1);
+}
+try {
+  await run(opts);
+} catch (err) {
+  console.error(`错误: ${err.message}`);
+  process.exit(1);
+}
@@ -0,0 +1,84 @@
+#!/usr/bin/env node
+// 任务队列吞吐基准：同一批任务在不同并发数下的总耗时
+//
+// 用模拟 worker（一个按固定时长输出 stream-json 的 node 子进程）代替 Claude，
+// 测的是队列本身的调度开销和并发收益，不消耗额度。
+//
+// 用法：
+//   node bench.mjs [--jobs 24] [--workers 1,2,4,8] [--duration 500]
+
+import fs from 'node:fs';
+import os from 'node:os';
+import path from 'node:path';
+import { Runner } from './lib/runner.mjs';
+import { JobStore } from './lib/store.mjs';
+
+function parseArgs(argv) {
+  const opts = { jobs: 24, workers: [1, 2, 4, 8], duration: 500 };
+  for (let i = 0; i < argv.length; i++) {
+    if (argv[i] === '--jobs') opts.jobs = Number.parseInt(argv[++i], 10);
+    else if (argv[i] === '--workers') opts.workers = argv[++i].split(',').map(Number);
+    else if (argv[i] === '--duration') opts.duration = Number.parseInt(argv[++i], 10);
+  }
+  return opts;
+}
+
+const FAKE_WORKER = `
+const steps = 5;
+const total = Number(process.argv[1]);
+let i = 0;
+const timer = setInterval(() => {
+  i++;
+  console.log(JSON.stringify({ type: 'assistant', message: { content: [{ type: 'text', text: 'step ' + i }] } }));
+  if (i === steps) {
+    clearInterval(timer);
+    console.log(JSON.stringify({ type: 'result', result: 'ok' }));
+  }
+}, total / steps);
+`;
+
+async function runOnce(jobs, workers, duration) {
+  const dir = fs.mkdtempSync(path.join(os.tmpdir(), 'mycc-taskq-bench-'));
+  const store = new JobStore(dir);
+  for (let i = 0; i < jobs; i++) store.submit({ prompt: `job ${i}`, priority: i % 3 });
+
+  const runner = new Runner({
+    store,
+    workers,
+    command: () => ({ cmd: process.execPath, args: ['-e', FAKE_WORKER, String(duration)] }),
+  });
+  const start = process.hrtime.bigint();
+  await runner.run({ untilIdle: true });
+  const elapsed = Number(process.hrtime.bigint() - start) / 1e6;
+
+  store.refresh();
+  const waits = [...store.jobs.values()].map((job) => Date.parse(job.startedAt) - Date.parse(job.submittedAt));
+  const done = [...store.jobs.values()].filter((job) => job.status === 'done').length;
+  fs.rmSync(dir, { recursive: true, force: true });
+  return { elapsed, done, avgWait: waits.reduce((a, b) => a + b, 0) / waits.length };
+}
+
+async function main() {
+  const opts = parseArgs(process.argv.slice(2));
+  console.log(`${opts.jobs} 个任务，每个约 ${opts.duration} ms\n`);
+  console.log('worker   总耗时ms   吞吐(个/秒)   平均排队ms   加速比   完成');
+  let baseline;
+  for (const workers of opts.workers) {
+    const { elapsed, done, avgWait } = await runOnce(opts.jobs, workers, opts.duration);
+    baseline ??= elapsed;
+    console.log(
+      [
+        String(workers).padStart(6),
+        elapsed.toFixed(0).padStart(10),
+        ((opts.jobs / elapsed) * 1000).toFixed(2).padStart(12),
+        avgWait.toFixed(0).padStart(12),
+        `${(baseline / elapsed).toFixed(2)}x`.padStart(8),
+        `${done}/${opts.jobs}`.padStart(6),
+      ].join(' '),
+    );
+  }
+  const ideal = opts.jobs * opts.duration;
+  console.log(`\n单 worker 理论下限 ${ideal} ms；超出部分为进程启动和调度开销`);
+}
+
+await main();
@@ -0,0 +1,77 @@
+// 把任务进度推回来源通道
+//
+// feishu：用 .env 里的飞书应用凭证直接发消息到 FEISHU_RECEIVE_USER_ID
+// cli / web：不主动推送，进度写在任务日志里，用 `taskq.mjs tail <id>` 查看
+
+const FEISHU_API = 'https://open.feishu.cn/open-apis';
+
+const FINISH_LABELS = {
+  done: ['✅', '完成'],
+  failed: ['❌', '失败'],
+  cancelled: ['⏹', '已取消'],
+};
+
+class FeishuNotifier {
+  constructor(env) {
+    this.appId = env.FEISHU_APP_ID;
+    this.appSecret = env.FEISHU_APP_SECRET;
+    this.receiveId = env.FEISHU_RECEIVE_USER_ID;
+    this.receiveIdType = env.FEISHU_RECEIVE_ID_TYPE || 'chat_id';
+    this.token = null;
+    this.tokenExpiresAt = 0;
+  }
+
+  get enabled() {
+    return Boolean(this.appId && this.appSecret && this.receiveId);
+  }
+
+  async tenantToken() {
+    if (this.token && Date.now() < this.tokenExpiresAt) return this.token;
+    const res = await fetch(`${FEISHU_API}/auth/v3/tenant_access_token/internal`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ app_id: this.appId, app_secret: this.appSecret }),
+    });
+    const data = await res.json();
+    if (data.code !== 0) throw new Error(`获取飞书 token 失败: ${data.msg}`);
+    this.token = data.tenant_access_token;
+    // 提前 5 分钟刷新
+    this.tokenExpiresAt = Date.now() + (data.expire - 300) * 1000;
+    return this.token;
+  }
+
+  async send(text) {
+    const token = await this.tenantToken();
+    const res = await fetch(`${FEISHU_API}/im/v1/messages?receive_id_type=${this.receiveIdType}`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json', Authorization: `Bearer ${token}` },
+      body: JSON.stringify({ receive_id: this.receiveId, msg_type: 'text', content: JSON.stringify({ text }) }),
+    });
+    const data = await res.json();
+    if (data.code !== 0) throw new Error(`飞书消息发送失败: ${data.msg}`);
+  }
+}
+
+export function createNotifier(env = process.env) {
+  const feishu = new FeishuNotifier(env);
+
+  const send = async (job, text) => {
+    if (job.origin !== 'feishu' || !feishu.enabled) return;
+    try {
+      await feishu.send(text);
+    } catch (err) {
+      // 通知失败不影响任务本身
+      console.error(`[tasks] ${err.message}`);
+    }
+  };
+
+  return {
+    started: (job) => send(job, `▶️ 任务开始 [${job.id}] ${job.title}`),
+    progress: (job, text) => send(job, `⏳ [${job.id}] ${text}`),
+    finished: (job) => {
+      const [icon, label] = FINISH_LABELS[job.status] ?? ['•', job.status];
+      const summary = job.summary ? `\n\n${job.summary}` : '';
+      return send(job, `${icon} 任务${label} [${job.id}] ${job.title}${summary}`);
+    },
+  };
+}
@@ -0,0 +1,328 @@
+// 任务执行器：N 个并发 worker，从 JobStore 取任务、起 Claude 进程、回写状态
+//
+// 同一个队列只允许一个执行器（runner.pid 锁）。执行器启动时，上次崩溃遗留的
+// running 任务会被重新排队；同一任务最多启动 maxAttempts 次。
+
+import { spawn, spawnSync } from 'node:child_process';
+import fs from 'node:fs';
+import path from 'node:path';
+import { STATUS } from './store.mjs';
+
+const SUMMARY_CHARS = 500;
+// ps 的 etime 精度为秒，再留一点启动耗时的余量
+const START_TIME_TOLERANCE_MS = 2000;
+
+// 默认用 Claude Code 的 print 模式跑任务，prompt 走 stdin，避免 Windows 下参数转义问题
+export function claudeCommand(job) {
+  const extra = (process.env.MYCC_TASK_CLAUDE_ARGS || '').split(/\s+/).filter(Boolean);
+  return { cmd: 'claude', args: ['-p', '--output-format', 'stream-json', '--verbose', ...extra], input: job.prompt };
+}
+
+// 把 stream-json 的一行转成可读进度；非 JSON 行原样返回
+export function describeLine(line) {
+  let event;
+  try {
+    event = JSON.parse(line);
+  } catch {
+    return { text: line.trim() };
+  }
+  if (event.type === 'assistant') {
+    const parts = [];
+    for (const block of event.message?.content ?? []) {
+      if (block.type === 'text' && block.text.trim()) parts.push(block.text.trim());
+      else if (block.type === 'tool_use') parts.push(`[${block.name}]`);
+    }
+    return { text: parts.join(' ') };
+  }
+  if (event.type === 'result') {
+    return { text: '', result: event.result ?? '' };
+  }
+  return { text: '' };
+}
+
+function isAlive(pid) {
+  try {
+    process.kill(pid, 0);
+    return true;
+  } catch {
+    return false;
+  }
+}
+
+// 进程启动时间（毫秒时间戳），用来确认 PID 没有被别的进程复用；取不到时返回 null
+function processStartMs(pid) {
+  if (process.platform === 'win32') {
+    const query = `(Get-CimInstance Win32_Process -Filter "ProcessId=${pid}").CreationDate.ToUniversalTime().ToString('o')`;
+    const result = spawnSync('powershell', ['-NoProfile', '-NonInteractive', '-Command', query], {
+      encoding: 'utf8',
+      timeout: 10000,
+      windowsHide: true,
+    });
+    const startedMs = Date.parse(result.stdout?.trim() ?? '');
+    return Number.isNaN(startedMs) ? null : startedMs;
+  }
+  const result = spawnSync('ps', ['-o', 'etime=', '-p', String(pid)], { encoding: 'utf8' });
+  const match = result.stdout?.trim().match(/^(?:(\d+)-)?(?:(\d+):)?(\d+):(\d+)$/);
+  if (!match) return null;
+  const [, days = 0, hours = 0, minutes, seconds] = match;
+  const elapsed = ((Number(days) * 24 + Number(hours)) * 60 + Number(minutes)) * 60 + Number(seconds);
+  return Date.now() - elapsed * 1000;
+}
+
+function readLock(file) {
+  try {
+    const [pid, startedAt] = fs.readFileSync(file, 'utf8').split('\n');
+    return { pid: Number.parseInt(pid, 10), startedAt: startedAt?.trim() };
+  } catch (err) {
+    if (err.code === 'ENOENT') return null;
+    throw err;
+  }
+}
+
+// 连同 Claude 起的工具子进程一起结束（POSIX 下 worker 是独立进程组）
+function killTree(pid) {
+  if (process.platform === 'win32') {
+    spawn('taskkill', ['/pid', String(pid), '/T', '/F'], { windowsHide: true });
+    return;
+  }
+  try {
+    process.kill(-pid, 'SIGTERM');
+  } catch {
+    try {
+      process.kill(pid, 'SIGTERM');
+    } catch {
+      // 进程已退出
+    }
+  }
+}
+
+export class Runner {
+  constructor({
+    store,
+    workers = 2,
+    maxAttempts = 3,
+    command = claudeCommand,
+    notifier,
+    progressIntervalMs = 30000,
+    defaultCwd = process.cwd(),
+  }) {
+    this.store = store;
+    this.workers = workers;
+    this.maxAttempts = maxAttempts;
+    this.command = command;
+    this.notifier = notifier;
+    this.progressIntervalMs = progressIntervalMs;
+    this.defaultCwd = defaultCwd;
+    this.lockFile = path.join(store.dir, 'runner.pid');
+    // job id -> { child, killed, lastProgressAt, lastText, result, buffer }
+    this.active = new Map();
+    this.stopped = false;
+  }
+
+  // 锁文件内容为「PID\n启动时间」；遗留的锁记在 staleLock 里，recover() 用它判断哪些 worker 属于崩溃的执行器
+  acquireLock() {
+    const lock = readLock(this.lockFile);
+    if (lock?.pid && lock.pid !== process.pid && isAlive(lock.pid)) {
+      throw new Error(`已有执行器在运行 (PID: ${lock.pid})`);
+    }
+    this.staleLock = lock;
+    this.startedAt = new Date().toISOString();
+    fs.writeFileSync(this.lockFile, `${process.pid}\n${this.startedAt}`);
+  }
+
+  releaseLock() {
+    try {
+      if (readLock(this.lockFile)?.pid === process.pid) fs.unlinkSync(this.lockFile);
+    } catch {
+      // 锁文件已不存在
+    }
+  }
+
+  // 上次执行器留下的 running 任务，其 worker 现在的状态：
+  //   'gone'    进程已退出，或 PID 已被别的进程复用（启动时间对不上）
+  //   'ours'    任务由留下锁文件的那个（已退出的）执行器启动，且进程启动时间一致，可以放心结束
+  //   'unknown' 进程还在但无法确认身份（取不到启动时间，或不是那个执行器起的）
+  workerState(job) {
+    if (!job.pid || !isAlive(job.pid)) return 'gone';
+    const startedMs = processStartMs(job.pid);
+    if (startedMs === null) return 'unknown';
+    if (Math.abs(startedMs - Date.parse(job.startedAt)) > START_TIME_TOLERANCE_MS) return 'gone';
+    const stale = this.staleLock;
+    return stale && job.runner === stale.pid && job.runnerStartedAt === stale.startedAt ? 'ours' : 'unknown';
+  }
+
+  // 上次执行器崩溃时还在跑的任务：确认是它留下的 worker 才结束，然后重新排队；
+  // 无法确认的不杀也不重排（否则同一任务会有两个 worker），标记为遗留，等它自己退出
+  recover() {
+    for (const job of this.store.jobs.values()) {
+      if (job.status !== STATUS.RUNNING) continue;
+      const state = this.workerState(job);
+      if (state === 'unknown') {
+        if (!job.orphaned) this.store.append({ op: 'orphan', id: job.id });
+        continue;
+      }
+      if (state === 'ours') killTree(job.pid);
+      this.settleInterrupted(job);
+    }
+    this.store.refresh();
+  }
+
+  // 遗留 worker 退出后再处理对应任务。这里只看进程是否还在，PID 复用的情况留给下次 recover() 识别
+  reapOrphans() {
+    let reaped = false;
+    for (const job of this.store.jobs.values()) {
+      if (job.status !== STATUS.RUNNING || !job.orphaned || isAlive(job.pid)) continue;
+      this.settleInterrupted(job);
+      reaped = true;
+    }
+    if (reaped) this.store.refresh();
+  }
+
+  settleInterrupted(job) {
+    if (job.cancelRequested) {
+      this.store.append({ op: 'finish', id: job.id, status: STATUS.CANCELLED });
+    } else {
+      this.store.append({ op: 'requeue', id: job.id });
+    }
+  }
+
+  // 运行直到 stop()；untilIdle 为 true 时队列清空即返回
+  run({ untilIdle = false } = {}) {
+    this.acquireLock();
+    this.store.refresh();
+    this.recover();
+
+    return new Promise((resolve) => {
+      let watcher;
+      let finished = false;
+      const finish = () => {
+        if (finished) return;
+        finished = true;
+        clearInterval(timer);
+        watcher?.close();
+        this.releaseLock();
+        resolve();
+      };
+      const tick = () => {
+        if (this.stopped) {
+          if (this.active.size === 0) finish();
+          return;
+        }
+        this.tick();
+        if (untilIdle && this.active.size === 0 && !this.store.nextQueued()) {
+          this.stopped = true;
+          finish();
+        }
+      };
+      this.onChange = tick;
+      // 新提交/取消会追加到日志，监听目录即可立刻响应；定时器兜底
+      try {
+        watcher = fs.watch(this.store.dir, tick);
+      } catch {
+        watcher = undefined;
+      }
+      const timer = setInterval(tick, 1000);
+      tick();
+    });
+  }
+
+  stop() {
+    this.stopped = true;
+    for (const [, state] of this.active) killTree(state.child.pid);
+    this.onChange?.();
+  }
+
+  tick() {
+    this.store.refresh();
+    this.reapOrphans();
+    for (const [id, state] of this.active) {
+      const job = this.store.jobs.get(id);
+      if (job?.cancelRequested && !state.killed) {
+        state.killed = true;
+        killTree(state.child.pid);
+      }
+    }
+    while (this.active.size < this.workers) {
+      const job = this.store.nextQueued();
+      if (!job) break;
+      if ((job.attempts ?? 0) >= this.maxAttempts) {
+        this.giveUp(job);
+        continue;
+      }
+      this.startJob(job);
+    }
+  }
+
+  // 反复因执行器崩溃而中断的任务不再重试，避免卡死队列（正常停止不计次数）
+  giveUp(job) {
+    const summary = `执行中断 ${job.attempts} 次均未完成，不再重试`;
+    this.store.append({ op: 'finish', id: job.id, status: STATUS.FAILED, exitCode: null, summary });
+    this.store.refresh();
+    this.notifier?.finished(this.store.jobs.get(job.id));
+  }
+
+  startJob(job) {
+    const { cmd, args, input } = this.command(job);
+    const logFd = fs.openSync(this.store.jobLog(job.id), 'a');
+    const child = spawn(cmd, args, {
+      cwd: job.cwd || this.defaultCwd,
+      stdio: ['pipe', 'pipe', logFd],
+      shell: process.platform === 'win32',
+      detached: process.platform !== 'win32',
+      windowsHide: true,
+    });
+    const state = { child, killed: false, lastProgressAt: Date.now(), lastText: '', result: undefined, buffer: '' };
+    this.active.set(job.id, state);
+    this.store.append({ op: 'start', id: job.id, pid: child.pid, runner: process.pid, runnerStartedAt: this.startedAt });
+    this.store.refresh();
+    this.notifier?.started(job);
+
+    child.stdin.on('error', () => {});
+    child.stdin.end(input ?? '');
+
+    child.stdout.on('data', (chunk) => {
+      fs.writeSync(logFd, chunk);
+      state.buffer += chunk.toString('utf8');
+      const lines = state.buffer.split('\n');
+      state.buffer = lines.pop();
+      for (const line of lines) this.handleLine(job, state, line);
+    });
+
+    let done = false;
+    const complete = (event) => {
+      if (done) return;
+      done = true;
+      if (state.buffer) this.handleLine(job, state, state.buffer);
+      fs.closeSync(logFd);
+      this.active.delete(job.id);
+      this.store.append({ id: job.id, ...event });
+      this.store.refresh();
+      if (event.op === 'finish') this.notifier?.finished(this.store.jobs.get(job.id));
+      this.onChange?.();
+    };
+
+    child.on('error', (err) => complete({ op: 'finish', status: STATUS.FAILED, exitCode: null, summary: err.message }));
+    child.on('close', (code) => {
+      // 执行器退出导致的中断：重新排队，下次启动继续跑
+      if (this.stopped && !state.killed) return complete({ op: 'requeue', reason: 'stop' });
+      const summary = (state.result ?? state.lastText).slice(0, SUMMARY_CHARS);
+      let status = code === 0 ? STATUS.DONE : STATUS.FAILED;
+      if (state.killed) status = STATUS.CANCELLED;
+      return complete({ op: 'finish', status, exitCode: code, summary });
+    });
+  }
+
+  handleLine(job, state, line) {
+    if (!line.trim()) return;
+    const { text, result } = describeLine(line);
+    if (result !== undefined) state.result = result;
+    if (!text) return;
+    state.lastText = text;
+    // 进度推送节流，避免刷屏和触发平台限流
+    const now = Date.now();
+    if (now - state.lastProgressAt >= this.progressIntervalMs) {
+      state.lastProgressAt = now;
+      this.notifier?.progress(job, text.slice(0, 200));
+    }
+  }
+}
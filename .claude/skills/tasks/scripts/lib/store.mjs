@@ -0,0 +1,181 @@
+// 任务队列存储：追加写入的 JSONL 事件日志
+//
+// 每个状态变化（提交/开始/取消/结束）是一行事件，当前状态由事件依次折叠得到。
+// 只追加、每次写完 fsync，进程崩溃最多丢掉最后半行；半行在读取时跳过，
+// 下次写入前会先补上换行，不会和新事件粘在一起。
+
+import { randomBytes } from 'node:crypto';
+import fs from 'node:fs';
+import path from 'node:path';
+
+export const STATUS = {
+  QUEUED: 'queued',
+  RUNNING: 'running',
+  DONE: 'done',
+  FAILED: 'failed',
+  CANCELLED: 'cancelled',
+};
+
+export const FINISHED = new Set([STATUS.DONE, STATUS.FAILED, STATUS.CANCELLED]);
+
+export function newJobId() {
+  return `t${Date.now().toString(36)}${randomBytes(2).toString('hex')}`;
+}
+
+export class JobStore {
+  constructor(dir) {
+    this.dir = dir;
+    this.file = path.join(dir, 'jobs.log');
+    this.logDir = path.join(dir, 'logs');
+    this.jobs = new Map();
+    this.offset = 0;
+    this.seq = 0;
+    fs.mkdirSync(this.logDir, { recursive: true });
+  }
+
+  jobLog(id) {
+    return path.join(this.logDir, `${id}.log`);
+  }
+
+  append(event) {
+    const record = { ts: new Date().toISOString(), ...event };
+    const fd = fs.openSync(this.file, 'a+');
+    try {
+      const { size } = fs.fstatSync(fd);
+      let prefix = '';
+      if (size > 0) {
+        const last = Buffer.alloc(1);
+        fs.readSync(fd, last, 0, 1, size - 1);
+        if (last[0] !== 0x0a) prefix = '\n';
+      }
+      fs.writeSync(fd, `${prefix}${JSON.stringify(record)}\n`);
+      fs.fsyncSync(fd);
+    } finally {
+      fs.closeSync(fd);
+    }
+    return record;
+  }
+
+  // 增量读取上次之后新增的事件，返回新事件列表
+  refresh() {
+    let size;
+    try {
+      size = fs.statSync(this.file).size;
+    } catch {
+      return [];
+    }
+    if (size <= this.offset) return [];
+    const buffer = Buffer.alloc(size - this.offset);
+    const fd = fs.openSync(this.file, 'r');
+    try {
+      fs.readSync(fd, buffer, 0, buffer.length, this.offset);
+    } finally {
+      fs.closeSync(fd);
+    }
+    // 只消费到最后一个完整行，剩下的半行留到下次
+    const end = buffer.lastIndexOf(0x0a);
+    if (end === -1) return [];
+    this.offset += end + 1;
+
+    const events = [];
+    for (const line of buffer.subarray(0, end).toString('utf8').split('\n')) {
+      if (!line.trim()) continue;
+      try {
+        events.push(JSON.parse(line));
+      } catch {
+        // 崩溃留下的残缺行
+        continue;
+      }
+    }
+    for (const event of events) this.apply(event);
+    return events;
+  }
+
+  apply(event) {
+    const job = this.jobs.get(event.id);
+    switch (event.op) {
+      case 'submit':
+        this.jobs.set(event.id, {
+          id: event.id,
+          seq: this.seq++,
+          title: event.title,
+          prompt: event.prompt,
+          priority: event.priority ?? 0,
+          origin: event.origin ?? 'cli',
+          cwd: event.cwd,
+          status: STATUS.QUEUED,
+          submittedAt: event.ts,
+        });
+        break;
+      case 'start':
+        if (!job) break;
+        job.status = STATUS.RUNNING;
+        job.startedAt = event.ts;
+        job.pid = event.pid;
+        job.runner = event.runner;
+        job.runnerStartedAt = event.runnerStartedAt;
+        job.attempts = (job.attempts ?? 0) + 1;
+        job.orphaned = false;
+        break;
+      case 'orphan':
+        // 执行器重启时 worker 仍在运行却无法确认身份：保持 running，等它退出后再处理
+        if (!job || job.status !== STATUS.RUNNING) break;
+        job.orphaned = true;
+        break;
+      case 'requeue':
+        if (!job) break;
+        job.status = STATUS.QUEUED;
+        job.pid = undefined;
+        job.orphaned = false;
+        // 执行器正常停止（Ctrl+C）时放回的任务，这次启动不算一次尝试
+        if (event.reason === 'stop') job.attempts -= 1;
+        break;
+      case 'cancel':
+        if (!job || FINISHED.has(job.status)) break;
+        if (job.status === STATUS.QUEUED) {
+          job.status = STATUS.CANCELLED;
+          job.finishedAt = event.ts;
+        } else {
+          job.cancelRequested = true;
+        }
+        break;
+      case 'finish':
+        if (!job) break;
+        job.status = event.status;
+        job.exitCode = event.exitCode;
+        job.summary = event.summary;
+        job.finishedAt = event.ts;
+        job.pid = undefined;
+        job.orphaned = false;
+        break;
+      default:
+        break;
+    }
+  }
+
+  get(id) {
+    if (this.jobs.has(id)) return this.jobs.get(id);
+    // 支持前缀匹配，手机上少打几个字
+    const matches = [...this.jobs.keys()].filter((key) => key.startsWith(id));
+    return matches.length === 1 ? this.jobs.get(matches[0]) : undefined;
+  }
+
+  // 优先级高的先跑，同优先级先提交先跑
+  nextQueued() {
+    let best;
+    for (const job of this.jobs.values()) {
+      if (job.status !== STATUS.QUEUED) continue;
+      if (!best || job.priority > best.priority || (job.priority === best.priority && job.seq < best.seq)) {
+        best = job;
+      }
+    }
+    return best;
+  }
+
+  submit({ prompt, title, priority = 0, origin = 'cli', cwd }) {
+    const id = newJobId();
+    this.append({ op: 'submit', id, prompt, title: title || prompt.split('\n')[0].slice(0, 40), priority, origin, cwd });
+    this.refresh();
+    return this.jobs.get(id);
+  }
+}
@@ -0,0 +1,249 @@
+#!/usr/bin/env node
+// 跨会话任务队列 CLI
+//
+// 用法：
+//   node taskq.mjs submit <prompt...> [-p 优先级] [--title 标题] [--origin cli|web|feishu] [--cwd 目录]
+//   node taskq.mjs list [--all]
+//   node taskq.mjs status <id>
+//   node taskq.mjs tail <id> [-f]
+//   node taskq.mjs cancel <id>
+//   node taskq.mjs run [-w 并发数] [--until-idle]
+//
+// 任务存放在 tasks/.queue/（jobs.log 为事件日志，logs/ 为每个任务的输出）。
+
+import fs from 'node:fs';
+import path from 'node:path';
+import { fileURLToPath } from 'node:url';
+import { createNotifier } from './lib/notify.mjs';
+import { Runner, describeLine } from './lib/runner.mjs';
+import { FINISHED, JobStore, STATUS } from './lib/store.mjs';
+
+const PROJECT_DIR = path.resolve(path.dirname(fileURLToPath(import.meta.url)), '..', '..', '..', '..');
+const QUEUE_DIR = path.join(PROJECT_DIR, 'tasks', '.queue');
+const ENV_FILE = path.join(PROJECT_DIR, '.env');
+
+const STATUS_ICONS = {
+  [STATUS.QUEUED]: '⏸',
+  [STATUS.RUNNING]: '▶️',
+  [STATUS.DONE]: '✅',
+  [STATUS.FAILED]: '❌',
+  [STATUS.CANCELLED]: '⏹',
+};
+
+function parseArgs(argv) {
+  const opts = { command: argv[0], rest: [], priority: 0, origin: 'cli', follow: false, all: false, untilIdle: false };
+  for (let i = 1; i < argv.length; i++) {
+    const arg = argv[i];
+    if (arg === '-p' || arg === '--priority') opts.priority = Number.parseInt(argv[++i], 10) || 0;
+    else if (arg === '--title') opts.title = argv[++i];
+    else if (arg === '--origin') opts.origin = argv[++i];
+    else if (arg === '--cwd') opts.cwd = path.resolve(argv[++i]);
+    else if (arg === '-w' || arg === '--workers') opts.workers = Number.parseInt(argv[++i], 10);
+    else if (arg === '-f' || arg === '--follow') opts.follow = true;
+    else if (arg === '--all') opts.all = true;
+    else if (arg === '--until-idle') opts.untilIdle = true;
+    else opts.rest.push(arg);
+  }
+  return opts;
+}
+
+// 与 start-mycc.sh 一致：已有的环境变量优先，.env 只补缺
+function loadEnvFile() {
+  let text;
+  try {
+    text = fs.readFileSync(ENV_FILE, 'utf8');
+  } catch {
+    return;
+  }
+  for (const line of text.split('\n')) {
+    const trimmed = line.trim();
+    if (!trimmed || trimmed.startsWith('#')) continue;
+    const eq = trimmed.indexOf('=');
+    if (eq === -1) continue;
+    const key = trimmed.slice(0, eq).trim();
+    if (process.env[key] === undefined) process.env[key] = trimmed.slice(eq + 1).trim();
+  }
+}
+
+function openStore() {
+  const store = new JobStore(QUEUE_DIR);
+  store.refresh();
+  return store;
+}
+
+function findJob(store, id) {
+  if (!id) throw new Error('请提供任务 ID');
+  const job = store.get(id);
+  if (!job) throw new Error(`找不到任务 ${id}`);
+  return job;
+}
+
+function formatJob(job) {
+  const priority = job.priority ? ` p${job.priority}` : '';
+  const orphaned = job.orphaned ? `  （遗留 worker PID ${job.pid} 仍在运行，无法确认，退出后再处理）` : '';
+  return `${STATUS_ICONS[job.status] ?? '•'} ${job.id}${priority}  [${job.origin}]  ${job.title}${orphaned}`;
+}
+
+function submit(opts) {
+  let prompt = opts.rest.join(' ').trim();
+  if (prompt === '-' || (!prompt && !process.stdin.isTTY)) prompt = fs.readFileSync(0, 'utf8').trim();
+  if (!prompt) throw new Error('请提供任务内容');
+  const store = openStore();
+  const job = store.submit({ prompt, title: opts.title, priority: opts.priority, origin: opts.origin, cwd: opts.cwd });
+  const queued = [...store.jobs.values()].filter((j) => j.status === STATUS.QUEUED).length;
+  console.log(`已提交任务 ${job.id}（队列中 ${queued} 个）`);
+  if (!runnerAlive()) {
+    console.log('提示：执行器未运行，用 `node .claude/skills/tasks/scripts/taskq.mjs run` 启动');
+  }
+}
+
+function runnerAlive() {
+  try {
+    const pid = Number.parseInt(fs.readFileSync(path.join(QUEUE_DIR, 'runner.pid'), 'utf8'), 10);
+    process.kill(pid, 0);
+    return true;
+  } catch {
+    return false;
+  }
+}
+
+function list(opts) {
+  const store = openStore();
+  const jobs = [...store.jobs.values()];
+  const active = jobs
+    .filter((job) => !FINISHED.has(job.status))
+    .sort((a, b) => (a.status === b.status ? b.priority - a.priority || a.seq - b.seq : a.status === STATUS.RUNNING ? -1 : 1));
+  const finished = jobs.filter((job) => FINISHED.has(job.status)).sort((a, b) => b.seq - a.seq);
+
+  console.log(`执行器：${runnerAlive() ? '运行中' : '未运行'}\n`);
+  if (active.length === 0) console.log('没有排队或运行中的任务');
+  for (const job of active) console.log(formatJob(job));
+  const shown = opts.all ? finished : finished.slice(0, 10);
+  if (shown.length > 0) {
+    console.log('\n最近完成：');
+    for (const job of shown) console.log(formatJob(job));
+  }
+}
+
+function status(opts) {
+  const job = findJob(openStore(), opts.rest[0]);
+  console.log(formatJob(job));
+  console.log(`提交：${job.submittedAt}`);
+  if (job.startedAt) console.log(`开始：${job.startedAt}`);
+  if (job.finishedAt) console.log(`结束：${job.finishedAt}${job.exitCode !== undefined ? `（退出码 ${job.exitCode}）` : ''}`);
+  if (job.cwd) console.log(`目录：${job.cwd}`);
+  console.log(`\n${job.prompt}`);
+  if (job.summary) console.log(`\n结果：\n${job.summary}`);
+}
+
+function printLines(text) {
+  for (const line of text.split('\n')) {
+    if (!line.trim()) continue;
+    const { text: progress, result } = describeLine(line);
+    if (progress) console.log(progress);
+    if (result) console.log(`\n=== 结果 ===\n${result}`);
+  }
+}
+
+async function tail(opts) {
+  const store = openStore();
+  const job = findJob(store, opts.rest[0]);
+  const file = store.jobLog(job.id);
+  let offset = 0;
+  let pending = '';
+  const drain = () => {
+    let size;
+    try {
+      size = fs.statSync(file).size;
+    } catch {
+      return;
+    }
+    if (size <= offset) return;
+    const buffer = Buffer.alloc(size - offset);
+    const fd = fs.openSync(file, 'r');
+    fs.readSync(fd, buffer, 0, buffer.length, offset);
+    fs.closeSync(fd);
+    offset = size;
+    const text = pending + buffer.toString('utf8');
+    const end = text.lastIndexOf('\n');
+    pending = text.slice(end + 1);
+    printLines(text.slice(0, end + 1));
+  };
+
+  drain();
+  if (!opts.follow) {
+    if (pending) printLines(pending);
+    console.log(`\n${formatJob(job)}`);
+    return;
+  }
+  while (true) {
+    store.refresh();
+    drain();
+    if (FINISHED.has(store.jobs.get(job.id).status)) {
+      if (pending) printLines(pending);
+      console.log(`\n${formatJob(store.jobs.get(job.id))}`);
+      return;
+    }
+    await new Promise((resolve) => setTimeout(resolve, 500));
+  }
+}
+
+function cancel(opts) {
+  const store = openStore();
+  const job = findJob(store, opts.rest[0]);
+  if (FINISHED.has(job.status)) {
+    console.log(`任务 ${job.id} 已结束（${job.status}）`);
+    return;
+  }
+  store.append({ op: 'cancel', id: job.id });
+  console.log(job.status === STATUS.QUEUED ? `已取消任务 ${job.id}` : `已请求取消运行中的任务 ${job.id}`);
+  if (job.orphaned) console.log(`注意：该任务的 worker（PID ${job.pid}）是上次执行器遗留的，无法确认身份，不会自动结束；确认后可手动结束`);
+}
+
+async function run(opts) {
+  loadEnvFile();
+  const workers = opts.workers || Number.parseInt(process.env.MYCC_TASK_WORKERS ?? '', 10) || 2;
+  const store = new JobStore(QUEUE_DIR);
+  const notifier = createNotifier();
+  const runner = new Runner({
+    store,
+    workers,
+    maxAttempts: Number.parseInt(process.env.MYCC_TASK_MAX_ATTEMPTS ?? '', 10) || 3,
+    notifier: {
+      started: (job) => {
+        console.log(`${STATUS_ICONS[STATUS.RUNNING]} 开始 ${job.id}  ${job.title}`);
+        return notifier.started(job);
+      },
+      progress: notifier.progress,
+      finished: (job) => {
+        console.log(`${STATUS_ICONS[job.status] ?? '•'} 结束 ${job.id}  ${job.title}`);
+        return notifier.finished(job);
+      },
+    },
+    progressIntervalMs: (Number.parseInt(process.env.MYCC_TASK_PROGRESS_INTERVAL ?? '', 10) || 30) * 1000,
+    defaultCwd: PROJECT_DIR,
+  });
+  const shutdown = () => {
+    console.log('\n正在停止执行器，运行中的任务会重新排队...');
+    runner.stop();
+  };
+  process.on('SIGINT', shutdown);
+  process.on('SIGTERM', shutdown);
+  console.log(`执行器已启动：${workers} 个 worker，队列目录 ${path.relative(PROJECT_DIR, QUEUE_DIR)}`);
+  await runner.run({ untilIdle: opts.untilIdle });
+  console.log('执行器已退出');
+}
+
+const opts = parseArgs(process.argv.slice(2));
+const commands = { submit, list, status, tail, cancel, run };
+const command = commands[opts.command];
+if (!command) {
+  console.log('用法: taskq.mjs <submit|list|status|tail|cancel|run> [参数]');
+  process.exit(1);
+}
+try {
+  await command(opts);
+} catch (err) {
+  console.error(`错误: ${err.message}`);
+  process.exit(1);
+}
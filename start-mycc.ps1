@@ -12,6 +12,8 @@ $LOG_FILE = "$PROJECT_DIR\.claude\skills\mycc\backend.log"
 $CONFIG_FILE = "$PROJECT_DIR\.claude\skills\mycc\current.json"
 $TSX_BIN = "$SCRIPT_DIR\node_modules\.bin\tsx"
 $ENV_FILE = "$PROJECT_DIR\.env"
+$READY_URL = "http://127.0.0.1:18080/ready"
+$STARTUP_TIMEOUT = 45
 
 # Load .env file if exists
 if (Test-Path $ENV_FILE) {
@@ -27,6 +29,46 @@ if (Test-Path $ENV_FILE) {
     }
 }
 
+function Test-PortOpen {
+    $client = New-Object System.Net.Sockets.TcpClient
+    try {
+        # Connect() takes 1-2s to fail on a refused port on Windows; cap the wait at 100ms
+        return $client.ConnectAsync("127.0.0.1", 18080).Wait(100)
+    } catch {
+        return $false
+    } finally {
+        $client.Close()
+    }
+}
+
+# The backend runs as cmd /c start_backend_temp.bat -> tsx -> node src/index.ts start
+function Test-BackendRunning {
+    $processes = Get-CimInstance Win32_Process -Filter "Name = 'node.exe' OR Name = 'cmd.exe'" -ErrorAction SilentlyContinue |
+                 Where-Object { $_.CommandLine -like "*src/index.ts start*" -or $_.CommandLine -like "*start_backend_temp.bat*" }
+    return [bool]$processes
+}
+
+# current.json is kept between restarts; only accept one written after this launch
+function Test-ConfigReady {
+    if (-not (Test-Path $CONFIG_FILE)) { return $false }
+    if ((Get-Item $CONFIG_FILE).LastWriteTimeUtc -le $launchedAt) { return $false }
+    try {
+        $config = Get-Content $CONFIG_FILE -Raw | ConvertFrom-Json
+        return [bool]($config.routeToken -and $config.pairCode -and $config.tunnelUrl)
+    } catch {
+        # Config not ready yet
+        return $false
+    }
+}
+
+# Startup stage timings, printed once the service is ready
+$stageTimings = @()
+function Add-StageTiming($name) {
+    $seconds = $script:stopwatch.Elapsed.TotalSeconds
+    $script:stageTimings += [PSCustomObject]@{ Stage = $name; Seconds = $seconds }
+    Write-Host ("  ✓ {0} ({1:N2}s)" -f $name, $seconds) -ForegroundColor Green
+}
+
 Clear-Host
 
 Write-Host ""
@@ -113,49 +155,88 @@ Set objShell = Nothing
 Set-Content -Path $vbsFile -Value $vbsContent -Encoding ASCII
 
 # Start hidden process
+$launchedAt = (Get-Date).ToUniversalTime()
+$stopwatch = [System.Diagnostics.Stopwatch]::StartNew()
 Start-Process -FilePath "wscript.exe" -ArgumentList $vbsFile -WindowStyle Hidden
 
-# Wait for process to start
-Start-Sleep -Seconds 3
+# Wait until port 18080 accepts connections, failing fast if the process exits
+$lastProcessCheck = 0
+while (-not (Test-PortOpen)) {
+    $elapsed = $stopwatch.Elapsed.TotalSeconds
+    if ($elapsed -ge $STARTUP_TIMEOUT) { break }
+    # Get-CimInstance is slow, so check once a second; allow 2s for wscript -> cmd -> node to spawn
+    if ($elapsed -ge 2 -and $elapsed - $lastProcessCheck -ge 1) {
+        $lastProcessCheck = $elapsed
+        if (-not (Test-BackendRunning)) {
+            Write-Host "  ERROR: Backend exited during startup" -ForegroundColor Red
+            Write-Host ""
+            if (Test-Path $LOG_FILE) { Get-Content $LOG_FILE -Tail 20 }
+            Write-Host ""
+            Read-Host "Press Enter to exit"
+            exit 1
+        }
+    }
+    Start-Sleep -Milliseconds 100
+}
 
-# Check if port 18080 is now listening
 $portProcess = Get-NetTCPConnection -LocalPort 18080 -ErrorAction SilentlyContinue |
                Where-Object State -eq "Listen" |
                Select-Object -ExpandProperty OwningProcess -ErrorAction SilentlyContinue
 
 if ($portProcess) {
     Write-Host "  Backend started (PID: $portProcess)" -ForegroundColor Green
+    Add-StageTiming "HTTP bound"
 } else {
     Write-Host "  WARNING: Port 18080 not listening yet" -ForegroundColor Yellow
 }
 
 Write-Host ""
 
-# Wait for config file
+# Wait for tunnel + registration
 Write-Host "[4/5] Waiting for service ready..." -ForegroundColor Yellow
-$timeout = 45
-$elapsed = 0
-while ($elapsed -lt $timeout) {
-    if (Test-Path $CONFIG_FILE) {
+$ready = $false
+$hasReadyEndpoint = $false
+try {
+    $probe = Invoke-WebRequest -Uri "${READY_URL}?stage=http&timeout=0" -UseBasicParsing -TimeoutSec 2
+    $hasReadyEndpoint = ($probe.StatusCode -eq 200)
+} catch {
+    # Older backend without /ready
+}
+
+if ($hasReadyEndpoint) {
+    # Backend exposes /ready: block on each stage (long-poll), no sleeping
+    foreach ($stage in @("tunnel", "registered")) {
+        $remaining = [Math]::Max(1, [int]($STARTUP_TIMEOUT - $stopwatch.Elapsed.TotalSeconds))
         try {
-            $config = Get-Content $CONFIG_FILE -Raw | ConvertFrom-Json
-            if ($config.routeToken -and $config.pairCode -and $config.tunnelUrl) {
-                break
-            }
+            Invoke-WebRequest -Uri "${READY_URL}?stage=$stage&timeout=$remaining" -UseBasicParsing -TimeoutSec ($remaining + 2) | Out-Null
         } catch {
-            # Config not ready yet
+            break
+        }
+        if ($stage -eq "tunnel") {
+            Add-StageTiming "tunnel up"
+        } else {
+            Add-StageTiming "registered"
+            $ready = $true
         }
     }
-    Start-Sleep -Seconds 1
-    $elapsed++
-    Write-Host "  Waiting... ($elapsed/$timeout sec)" -NoNewline
-    Write-Host "`r" -NoNewline
+} else {
+    # Watch current.json instead of polling once a second
+    $watcher = New-Object System.IO.FileSystemWatcher (Split-Path $CONFIG_FILE), (Split-Path $CONFIG_FILE -Leaf)
+    while ($stopwatch.Elapsed.TotalSeconds -lt $STARTUP_TIMEOUT) {
+        if (Test-ConfigReady) {
+            Add-StageTiming "registered"
+            $ready = $true
+            break
+        }
+        [void]$watcher.WaitForChanged([System.IO.WatcherChangeTypes]::All, 500)
+    }
+    $watcher.Dispose()
 }
 
 Write-Host ""
 
 # Check if started successfully
-if (-not (Test-Path $CONFIG_FILE)) {
+if (-not $ready -or -not (Test-ConfigReady)) {
     Write-Host ""
     Write-Host "  ERROR: Startup timeout!" -ForegroundColor Red
     Write-Host "  Check log: Get-Content '$LOG_FILE' -Tail 50" -ForegroundColor Gray
@@ -186,6 +267,12 @@ if ($config.tunnelUrl.Length -gt 50) {
 Write-Host "+------------------------------------------+" -ForegroundColor White
 Write-Host ""
 
+Write-Host "Startup timings:" -ForegroundColor Gray
+foreach ($timing in $stageTimings) {
+    Write-Host ("  {0,-12} {1:N2}s" -f $timing.Stage, $timing.Seconds) -ForegroundColor Gray
+}
+Write-Host ""
+
 Write-Host "+------------------------------------------+" -ForegroundColor White
 Write-Host "|  Feishu Channel Enabled:                  |" -ForegroundColor White
 Write-Host "+------------------------------------------+" -ForegroundColor White
@@ -224,19 +311,19 @@ Write-Host ""
 Write-Host "Showing initial logs (will exit in 30s)..." -ForegroundColor DarkYellow
 Write-Host ""
 
+# Follow the log with a shared reader instead of re-reading the whole file each second
 $timeoutEnd = (Get-Date).AddSeconds(30)
-$lastLines = @()
+$logStream = [System.IO.File]::Open($LOG_FILE, [System.IO.FileMode]::OpenOrCreate, [System.IO.FileAccess]::Read, [System.IO.FileShare]::ReadWrite)
+$logReader = New-Object System.IO.StreamReader($logStream)
 do {
-    if (Test-Path $LOG_FILE) {
-        $currentLines = Get-Content $LOG_FILE -ErrorAction SilentlyContinue
-        if ($currentLines.Count -gt $lastLines.Count) {
-            $newLines = $currentLines[$lastLines.Count..($currentLines.Count - 1)]
-            $newLines | ForEach-Object { Write-Host $_ }
-            $lastLines = $currentLines
-        }
+    $line = $logReader.ReadLine()
+    if ($null -ne $line) {
+        Write-Host $line
+    } else {
+        Start-Sleep -Milliseconds 200
     }
-    Start-Sleep -Seconds 1
 } while ((Get-Date) -lt $timeoutEnd)
+$logReader.Dispose()
 
 Write-Host ""
 Write-Host "============================================" -ForegroundColor Cyan
@@ -11,6 +11,8 @@ LOG_FILE="$PROJECT_DIR/.claude/skills/mycc/backend.log"
 CONFIG_FILE="$PROJECT_DIR/.claude/skills/mycc/current.json"
 ENV_FILE="$PROJECT_DIR/.env"
 TSX_BIN="$SCRIPT_DIR/node_modules/.bin/tsx"
+READY_URL="http://127.0.0.1:18080/ready"
+STARTUP_TIMEOUT=45
 
 # Load .env file if exists
 if [ -f "$ENV_FILE" ]; then
@@ -26,6 +28,41 @@ GRAY='\033[0;37m'
 WHITE='\033[1;37m'
 NC='\033[0m' # No Color
 
+# Millisecond clock (bash 5 builtin, perl fallback for macOS bash 3.2)
+now_ms() {
+    if [ -n "$EPOCHREALTIME" ]; then
+        local t=${EPOCHREALTIME/[.,]/}
+        echo $((t / 1000))
+    else
+        perl -MTime::HiRes=time -e 'printf "%d\n", time * 1000'
+    fi
+}
+
+# Format milliseconds as seconds, e.g. 3210 -> 3.21s
+fmt_secs() {
+    printf "%d.%02ds" $(($1 / 1000)) $((($1 % 1000) / 10))
+}
+
+# Startup stage timings, printed once the service is ready
+STAGE_TIMINGS=""
+record_stage() {
+    local elapsed=$(($(now_ms) - START_MS))
+    STAGE_TIMINGS="${STAGE_TIMINGS}$(printf '%-12s' "$1") $(fmt_secs $elapsed)\n"
+    echo -e "  ${GREEN}✓ $1 ($(fmt_secs $elapsed))${NC}"
+}
+
+# current.json is kept between restarts; only accept one written after this launch
+config_ready() {
+    [ -f "$CONFIG_FILE" ] && [ "$CONFIG_FILE" -nt "$START_MARKER" ] || return 1
+    if command -v jq &> /dev/null; then
+        jq -e '.routeToken and .pairCode and .tunnelUrl' "$CONFIG_FILE" >/dev/null 2>&1
+    else
+        grep -q '"routeToken"' "$CONFIG_FILE" && \
+            grep -q '"pairCode"' "$CONFIG_FILE" && \
+            grep -q '"tunnelUrl"' "$CONFIG_FILE"
+    fi
+}
+
 clear
 
 echo ""
@@ -87,53 +124,77 @@ echo -e "${YELLOW}[3/5] Starting backend...${NC}"
 [ -f "$LOG_FILE" ] && rm -f "$LOG_FILE"
 
 # Start in background using nohup
+START_MARKER=$(mktemp)
+START_MS=$(now_ms)
+DEADLINE_MS=$((START_MS + STARTUP_TIMEOUT * 1000))
 nohup "$TSX_BIN" "$SCRIPT_DIR/src/index.ts" start >> "$LOG_FILE" 2>&1 &
 BACKEND_PID=$!
 
-# Wait for process to start
-sleep 3
+# Wait until port 18080 accepts connections, failing fast if the process exits
+while ! (exec 3<>/dev/tcp/127.0.0.1/18080) 2>/dev/null; do
+    if ! kill -0 "$BACKEND_PID" 2>/dev/null; then
+        echo -e "  ${RED}ERROR: Backend exited during startup${NC}"
+        echo ""
+        tail -20 "$LOG_FILE" 2>/dev/null || true
+        echo ""
+        read -p "Press Enter to exit"
+        exit 1
+    fi
+    if [ "$(now_ms)" -ge "$DEADLINE_MS" ]; then
+        break
+    fi
+    sleep 0.1
+done
 
-# Check if port 18080 is now listening
 if lsof -Pi :18080 -sTCP:LISTEN -t >/dev/null 2>&1; then
     NEW_PID=$(lsof -Pi :18080 -sTCP:LISTEN -t)
     echo -e "  ${GREEN}Backend started (PID: $NEW_PID)${NC}"
+    record_stage "HTTP bound"
 else
     echo -e "  ${YELLOW}WARNING: Port 18080 not listening yet${NC}"
 fi
 
 echo ""
 
-# Wait for config file
+# Wait for tunnel + registration
 echo -e "${YELLOW}[4/5] Waiting for service ready...${NC}"
-timeout=45
-elapsed=0
-while [ $elapsed -lt $timeout ]; do
-    if [ -f "$CONFIG_FILE" ]; then
-        if command -v jq &> /dev/null; then
-            routeToken=$(jq -r '.routeToken // empty' "$CONFIG_FILE" 2>/dev/null)
-            pairCode=$(jq -r '.pairCode // empty' "$CONFIG_FILE" 2>/dev/null)
-            tunnelUrl=$(jq -r '.tunnelUrl // empty' "$CONFIG_FILE" 2>/dev/null)
-            if [ -n "$routeToken" ] && [ -n "$pairCode" ] && [ -n "$tunnelUrl" ]; then
-                break
-            fi
+READY=0
+if [ "$(curl -s -o /dev/null -w '%{http_code}' --max-time 2 "$READY_URL?stage=http&timeout=0" 2>/dev/null)" = "200" ]; then
+    # Backend exposes /ready: block on each stage (long-poll), no sleeping
+    for stage in tunnel registered; do
+        remaining=$(((DEADLINE_MS - $(now_ms)) / 1000))
+        [ $remaining -lt 1 ] && remaining=1
+        if ! curl -sf -o /dev/null --max-time $((remaining + 2)) "$READY_URL?stage=$stage&timeout=$remaining"; then
+            break
+        fi
+        if [ "$stage" = "tunnel" ]; then
+            record_stage "tunnel up"
         else
-            # Fallback: grep
-            if grep -q '"routeToken"' "$CONFIG_FILE" && \
-               grep -q '"pairCode"' "$CONFIG_FILE" && \
-               grep -q '"tunnelUrl"' "$CONFIG_FILE"; then
-                break
-            fi
+            record_stage "registered"
+            READY=1
         fi
-    fi
-    sleep 1
-    elapsed=$((elapsed + 1))
-    echo -ne "  Waiting... ($elapsed/$timeout sec)\r"
-done
+    done
+else
+    # Older backend without /ready: watch current.json
+    while [ "$(now_ms)" -lt "$DEADLINE_MS" ]; do
+        if ! kill -0 "$BACKEND_PID" 2>/dev/null; then
+            break
+        fi
+        if config_ready; then
+            record_stage "registered"
+            READY=1
+            break
+        fi
+        sleep 0.2
+    done
+fi
 
 echo ""
 
 # Check if started successfully
-if [ ! -f "$CONFIG_FILE" ]; then
+config_ready || READY=0
+rm -f "$START_MARKER"
+if [ $READY -ne 1 ]; then
     echo ""
     echo -e "  ${RED}ERROR: Startup timeout!${NC}"
     echo -e "  ${GRAY}Check log: tail -50 '$LOG_FILE'${NC}"
@@ -174,6 +235,10 @@ fi
 echo -e "${WHITE}+------------------------------------------+${NC}"
 echo ""
 
+echo -e "${GRAY}Startup timings:${NC}"
+echo -ne "$STAGE_TIMINGS" | sed 's/^/  /'
+echo ""
+
 # Feishu channel status
 if [ -n "$FEISHU_APP_ID" ]; then
     echo -e "${WHITE}+------------------------------------------+${NC}"
@@ -218,18 +283,14 @@ echo ""
 echo "Showing initial logs (will exit in 30s)..."
 echo ""
 
-timeout_end=$(($(date +%s) + 30))
-last_line_count=0
-while [ $(date +%s) -lt $timeout_end ]; do
-    if [ -f "$LOG_FILE" ]; then
-        current_line_count=$(wc -l < "$LOG_FILE")
-        if [ $current_line_count -gt $last_line_count ]; then
-            tail -n +$((last_line_count + 1)) "$LOG_FILE"
-            last_line_count=$current_line_count
-        fi
-    fi
-    sleep 1
-done
+tail -n +1 -f "$LOG_FILE" &
+TAIL_PID=$!
+# Stop the tail on Ctrl+C too, otherwise it keeps running detached
+trap 'kill $TAIL_PID 2>/dev/null' EXIT INT TERM
+sleep 30
+kill "$TAIL_PID" 2>/dev/null || true
+wait "$TAIL_PID" 2>/dev/null || true
+trap - EXIT INT TERM
 
 echo ""
 echo "============================================" | sed $'s/$/\\e[0;36m/'